@@ -0,0 +1,149 @@
+"""
+Productivity analytics for Pomodoro Strike
+Trends and distributions computed over the daily stats columns at once,
+with NumPy when it is installed and plain Python otherwise
+"""
+
+import itertools
+import math
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+class FocusAnalytics:
+    """Statistics over a DailyStats history, aligned to a calendar ending today.
+
+    The columns are copied once when the object is built and extended with
+    empty days up to today, so index i is the day with ordinal first + i and
+    days without sessions count as zero. Build a new instance to pick up
+    newer data.
+    """
+
+    def __init__(self, daily_stats, best_hours=None, today=None):
+        today = (today or date.today()).toordinal()
+        self.first = daily_stats.first if daily_stats.first is not None else today
+        self.days = max(0, today - self.first + 1)
+        self.columns = {}
+        for metric in ("focus_sessions", "focus_time", "tasks_completed", "productivity_score"):
+            column = daily_stats.column(metric)[:self.days] if daily_stats.first is not None else []
+            padding = self.days - len(column)
+            if np is not None:
+                self.columns[metric] = np.concatenate((np.asarray(column, dtype=float), np.zeros(padding)))
+            else:
+                self.columns[metric] = [float(value) for value in column] + [0.0] * padding
+        self.hours = [(best_hours or {}).get(hour, 0) for hour in range(24)]
+
+    def rolling_average(self, metric, window):
+        """Trailing mean over window days for every day (shorter at the start of the history)"""
+        values = self.columns[metric]
+        if np is not None:
+            sums = np.concatenate(([0.0], np.cumsum(values)))
+            index = np.arange(1, len(values) + 1)
+            start = np.maximum(index - window, 0)
+            return (sums[index] - sums[start]) / (index - start)
+        sums = [0.0] + list(itertools.accumulate(values))
+        return [(sums[i] - sums[max(i - window, 0)]) / (i - max(i - window, 0)) for i in range(1, len(values) + 1)]
+
+    def latest_average(self, metric, window):
+        """Mean of the last window days, today included"""
+        values = self.columns[metric][-window:]
+        return float(sum(values) / len(values)) if len(values) else 0.0
+
+    def week_over_week(self, metric):
+        """Totals of the last 7 days and the 7 before them, their difference and the change in percent"""
+        values = self.columns[metric]
+        this_week = float(sum(values[-7:]))
+        last_week = float(sum(values[-14:-7]))
+        delta = this_week - last_week
+        percent = delta / last_week * 100 if last_week else None
+        return {"this_week": this_week, "last_week": last_week, "delta": delta, "percent": percent}
+
+    def weekly_deltas(self, metric):
+        """Change of each complete 7-day block (ending today) against the block before it"""
+        values = self.columns[metric]
+        blocks = len(values) // 7
+        if np is not None:
+            sums = np.asarray(values[len(values) - blocks * 7:]).reshape(blocks, 7).sum(axis=1)
+            return np.diff(sums)
+        start = len(values) - blocks * 7
+        sums = [sum(values[start + i * 7:start + i * 7 + 7]) for i in range(blocks)]
+        return [b - a for a, b in zip(sums, sums[1:])]
+
+    def percentiles(self, metric="focus_time", percents=(25, 50, 75, 90), active_only=True):
+        """Percentiles of a daily metric, by default over days that had any focus session"""
+        values = self.columns[metric]
+        if np is not None:
+            if active_only:
+                values = values[self.columns["focus_sessions"] > 0]
+            if not len(values):
+                return {p: 0.0 for p in percents}
+            return {p: float(v) for p, v in zip(percents, np.percentile(values, percents))}
+
+        if active_only:
+            values = [v for v, s in zip(values, self.columns["focus_sessions"]) if s > 0]
+        values = sorted(values)
+        result = {}
+        for p in percents:
+            if not values:
+                result[p] = 0.0
+                continue
+            # Linear interpolation between closest ranks, as numpy.percentile does
+            rank = (len(values) - 1) * p / 100
+            low, high = math.floor(rank), math.ceil(rank)
+            result[p] = values[low] + (values[high] - values[low]) * (rank - low)
+        return result
+
+    def weekday_distribution(self, metric="focus_time"):
+        """Metric totals per weekday, Monday first"""
+        values = self.columns[metric]
+        offset = (self.first - 1) % 7  # weekday of the first day; ordinal 1 was a Monday
+        if np is not None:
+            weekdays = (np.arange(len(values)) + offset) % 7
+            return [float(v) for v in np.bincount(weekdays, weights=values, minlength=7)]
+        totals = [0.0] * 7
+        for i, value in enumerate(values):
+            totals[(i + offset) % 7] += value
+        return totals
+
+    def hour_distribution(self):
+        """Share of focus sessions started in each hour of the day"""
+        total = sum(self.hours)
+        return [count / total if total else 0.0 for count in self.hours]
+
+    def top_hours(self, count=3):
+        """Busiest hours as (hour, sessions), most sessions first"""
+        ranked = sorted(range(24), key=lambda hour: self.hours[hour], reverse=True)
+        return [(hour, self.hours[hour]) for hour in ranked[:count] if self.hours[hour]]
+
+    def streaks(self):
+        """Current and longest run of consecutive days with a focus session.
+
+        The current streak still counts while today has no session yet.
+        """
+        active = self.columns["focus_sessions"]
+        if np is not None:
+            flags = np.concatenate(([0], (np.asarray(active) > 0).astype(np.int8), [0]))
+            edges = np.diff(flags)
+            runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+            last_end = int(np.flatnonzero(edges == -1)[-1]) if len(runs) else -1
+            longest = int(runs.max()) if len(runs) else 0
+            last_run = int(runs[-1]) if len(runs) else 0
+        else:
+            longest = run = last_run = 0
+            last_end = -1
+            for index, value in enumerate(active):
+                run = run + 1 if value > 0 else 0
+                if run:
+                    last_run, last_end = run, index + 1
+                longest = max(longest, run)
+
+        # A run ending today, or yesterday while today is still empty, is current
+        current = last_run if last_end >= self.days - 1 else 0
+        return current, longest
+
@@ -0,0 +1,92 @@
+"""
+Productivity analytics benchmark
+Times the Statistics tab's trends on a synthetic 10-year history, computed
+the original way (dict lookups per day) against FocusAnalytics over the
+daily stats columns, with NumPy if it is installed
+
+Run from the Python directory: python benchmarks/analytics.py [years]
+"""
+
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import FocusAnalytics, np
+from daily_stats import DailyStats
+
+
+def make_history(days, today, seed=1):
+    random.seed(seed)
+    history = {}
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        sessions = random.choice((0, 0, 2, 4, 6, 8))
+        history[day.isoformat()] = {
+            "focus_sessions": sessions,
+            "focus_time": sessions * 25,
+            "tasks_completed": random.randint(0, 5),
+            "productivity_score": random.random() * 100
+        }
+    best_hours = defaultdict(int, {hour: random.randint(0, 500) for hour in range(24)})
+    return history, best_hours
+
+
+def dict_based(history, best_hours, today, days):
+    """The trends computed from the stats dict, one day at a time"""
+    day_keys = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    rolling = {}
+    for index, day in enumerate(day_keys):
+        for window in (7, 30):
+            window_days = day_keys[index:index + window]
+            rolling[day, window] = sum(history[d]["focus_time"] for d in window_days if d in history) / len(window_days)
+    this_week = sum(history[d]["focus_time"] for d in day_keys[:7] if d in history)
+    last_week = sum(history[d]["focus_time"] for d in day_keys[7:14] if d in history)
+    active = sorted(stats["focus_time"] for stats in history.values() if stats["focus_sessions"])
+    median = active[len(active) // 2]
+    weekdays = defaultdict(float)
+    for day, stats in history.items():
+        weekdays[date.fromisoformat(day).weekday()] += stats["focus_time"]
+    longest = run = 0
+    for day in sorted(history):
+        run = run + 1 if history[day]["focus_sessions"] else 0
+        longest = max(longest, run)
+    top = sorted(best_hours.items(), key=lambda x: x[1], reverse=True)[:3]
+    return this_week - last_week, median, longest, top
+
+
+def columnar(daily, best_hours, today):
+    analytics = FocusAnalytics(daily, best_hours, today)
+    analytics.rolling_average("focus_time", 7)
+    analytics.rolling_average("focus_time", 30)
+    delta = analytics.week_over_week("focus_time")["delta"]
+    median = analytics.percentiles("focus_time", (50,))[50]
+    analytics.weekday_distribution()
+    return delta, median, analytics.streaks()[1], analytics.top_hours(3)
+
+
+def main(years=10, repeats=5):
+    today = date.today()
+    days = years * 365
+    history, best_hours = make_history(days, today)
+    daily = DailyStats(history)
+
+    runs = (
+        ("dict-based", lambda: dict_based(history, best_hours, today, days)),
+        ("FocusAnalytics", lambda: columnar(daily, best_hours, today))
+    )
+    for name, function in runs:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            result = function()
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{name:15} {elapsed * 1000:8.2f} ms  {result}")
+    print(f"NumPy {'available' if np is not None else 'not installed, plain Python fallback'}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
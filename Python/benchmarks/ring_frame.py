@@ -0,0 +1,87 @@
+"""
+ProgressRing frame-time benchmark
+Times one glow animation frame drawn the original way (delete every canvas
+item and recreate the glow layers and rings) against the retained-item
+ProgressRing, which only moves the glow layers in place
+
+Run from the Python directory: python benchmarks/ring_frame.py [frames]
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk
+import tkinter as tk
+
+from pomodoro_strike import ProgressRing
+
+
+def legacy_frame(ring, canvas, step):
+    """One frame of the original draw_ring: clear the canvas and rebuild everything"""
+    canvas.delete("all")
+
+    pulse_factor = (math.sin(math.radians(step)) + 1) / 2
+    num_layers = 15
+    for i in range(num_layers):
+        radius = ring.radius + (i * 2) * pulse_factor
+        alpha = 1 - (i / num_layers)
+        glow_color = ring.interpolate_color(ring._apply_appearance_mode(ring._fg_color), ring.glow_color, 0.1 * alpha)
+        canvas.create_oval(
+            ring.center - radius, ring.center - radius,
+            ring.center + radius, ring.center + radius,
+            outline=glow_color, width=2
+        )
+
+    bbox = (ring.center - ring.radius, ring.center - ring.radius,
+            ring.center + ring.radius, ring.center + ring.radius)
+    canvas.create_arc(*bbox, start=0, extent=360, width=ring.ring_width,
+                      outline=ring._apply_appearance_mode(("gray70", "gray30")), style="arc")
+    canvas.create_arc(*bbox, start=90, extent=-ring.progress * 360, width=ring.ring_width,
+                      outline=ring.glow_color, style="arc")
+
+
+def time_frames(root, draw_frame, frames):
+    """Mean and worst wall time per frame, including Tk's redraw of the canvas"""
+    durations = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        draw_frame(frame)
+        root.update_idletasks()
+        durations.append(time.perf_counter() - start)
+    return sum(durations) / frames, max(durations)
+
+
+def main(frames=2000):
+    root = ctk.CTk()
+    root.geometry("700x400")
+
+    ring = ProgressRing(root, size=300)
+    ring.pack(side="left", padx=10)
+    ring.cancel_animation()  # frames are driven by the benchmark
+    ring.set_progress(0.4)
+
+    legacy_canvas = tk.Canvas(root, width=ring.size, height=ring.size,
+                              bg=ring.canvas.cget("bg"), highlightthickness=0)
+    legacy_canvas.pack(side="left", padx=10)
+    root.update()
+
+    def retained_frame(frame):
+        ring.animation_step += 2
+        ring.draw_pulsating_glow()
+
+    results = {
+        "delete + recreate": time_frames(root, lambda frame: legacy_frame(ring, legacy_canvas, frame * 2), frames),
+        "retained items": time_frames(root, retained_frame, frames)
+    }
+    for name, (mean, worst) in results.items():
+        print(f"{name:18} {mean * 1000:7.3f} ms/frame mean  {worst * 1000:7.3f} ms worst")
+    print(f"canvas items: {len(legacy_canvas.find_all())} recreated per frame vs {len(ring.canvas.find_all())} retained")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
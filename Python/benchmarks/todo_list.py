@@ -0,0 +1,124 @@
+"""
+Task list benchmark
+Times opening, scrolling and patching the virtualized task list at 100, 1k,
+10k and 50k todos. For comparison at the smaller sizes, it also times the
+original approach of building one row of widgets per task in a scrollable
+frame.
+
+Run from the Python directory: python benchmarks/todo_list.py [legacy max]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk
+
+from pomodoro_strike import PomodoroStrike, TodoItem, TodoRow, VirtualTodoList
+from todo_store import TodoStore
+
+SIZES = (100, 1000, 10000, 50000)
+WORDS = "write review plan email call read fix test deploy refactor document meeting report".split()
+
+
+class BenchApp:
+    """The parts of PomodoroStrike that task rows call back into"""
+    get_category_color = PomodoroStrike.get_category_color
+    get_priority_color = PomodoroStrike.get_priority_color
+    get_due_date_color = PomodoroStrike.get_due_date_color
+
+    def toggle_todo(self, todo_id, completed_var):
+        pass
+
+    def delete_todo(self, todo_id):
+        pass
+
+
+def make_todos(count, seed=1):
+    random.seed(seed)
+    todos = []
+    for index in range(count):
+        todo = TodoItem(
+            " ".join(random.choices(WORDS, k=random.choice((2, 4, 8, 16)))),
+            completed=random.random() < 0.3,
+            category=random.choice(("Work", "Study", "Personal", "General")),
+            priority=random.choice(("Urgent", "High", "Medium", "Low")),
+            due_date=random.choice((None, "2026-11-01", "2026-12-24"))
+        )
+        todo.id = index + 1
+        todo.estimated_time = random.choice((0, 25, 50))
+        todos.append(todo)
+    return todos
+
+
+def timed(root, action):
+    start = time.perf_counter()
+    action()
+    root.update_idletasks()
+    return time.perf_counter() - start
+
+
+def bench_virtual(root, count):
+    store = TodoStore(make_todos(count))
+    container = ctk.CTkFrame(root, width=320, height=700)
+    container.pack(side="left", fill="y")
+    container.pack_propagate(False)
+    todo_list = VirtualTodoList(container, BenchApp(), store)
+    todo_list.pack(fill="both", expand=True)
+    root.update()
+
+    results = {"open": timed(root, todo_list.refresh)}
+
+    # Scroll from top to bottom in 50 steps
+    step = todo_list.offsets[-1] / 50
+    results["scroll"] = timed(root, lambda: [todo_list.scroll_by(step) for _ in range(50)]) / 50
+
+    # Complete one visible task
+    def toggle():
+        todo = store.todo_at(todo_list.visible_range()[0])
+        todo.completed = not todo.completed
+        old_index, _ = store.update(todo)
+        todo_list.update_item(todo, old_index)
+    results["toggle"] = timed(root, toggle)
+    results["rows"] = todo_list.rows_created
+
+    container.destroy()
+    return results
+
+
+def bench_legacy(root, count):
+    """One row of widgets per task, packed into a scrollable frame"""
+    frame = ctk.CTkScrollableFrame(root, width=320, height=700)
+    frame.pack(side="left", fill="y")
+    app = BenchApp()
+
+    def render():
+        for todo in TodoStore(make_todos(count)).sorted():
+            row = TodoRow(frame, app)
+            row.bind_todo(todo)
+            row.pack(fill="x", pady=2)
+
+    elapsed = timed(root, render)
+    frame.destroy()
+    return elapsed
+
+
+def main(legacy_max=1000):
+    root = ctk.CTk()
+    root.geometry("700x720")
+    root.update()
+
+    print(f"{'todos':>7} {'open':>10} {'scroll/step':>12} {'toggle':>10} {'rows':>6} {'legacy open':>12}")
+    for count in SIZES:
+        results = bench_virtual(root, count)
+        legacy = f"{bench_legacy(root, count) * 1000:9.1f} ms" if count <= legacy_max else "skipped"
+        print(f"{count:>7} {results['open'] * 1000:7.1f} ms {results['scroll'] * 1000:9.2f} ms "
+              f"{results['toggle'] * 1000:7.2f} ms {results['rows']:>6} {legacy:>12}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
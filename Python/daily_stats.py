@@ -0,0 +1,274 @@
+"""
+Daily statistics for Pomodoro Strike
+Columnar per-day metrics keyed by day ordinal, with a dict-style view
+"""
+
+import array
+import itertools
+import sys
+from collections.abc import MutableMapping
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+METRICS = ("focus_sessions", "focus_time", "tasks_completed", "productivity_score")
+TYPECODES = {
+    "focus_sessions": "q",
+    "focus_time": "q",
+    "tasks_completed": "q",
+    "productivity_score": "d"
+}
+
+
+def day_ordinal(day):
+    """Ordinal of a "%Y-%m-%d" day key"""
+    return date.fromisoformat(day).toordinal()
+
+
+def day_key(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+class DayStatsView(MutableMapping):
+    """One day's metrics, read and written straight from the columns"""
+
+    __slots__ = ("stats", "ordinal")
+
+    def __init__(self, stats, ordinal):
+        self.stats = stats
+        self.ordinal = ordinal
+
+    def __getitem__(self, metric):
+        return self.stats.columns[metric][self.ordinal - self.stats.first]
+
+    def __setitem__(self, metric, value):
+        stats = self.stats
+        column = stats.columns[metric]
+        index = self.ordinal - stats.first
+        old_value = column[index]
+        column[index] = value if column.typecode == "d" else int(value)
+
+        # Sessions land on the newest day, whose running totals are the last ones
+        if stats.prefix is not None:
+            if index == len(column) - 1:
+                stats.prefix[metric][-1] += column[index] - old_value
+            else:
+                stats.prefix = None
+
+    def __delitem__(self, metric):
+        self[metric] = 0
+
+    def __iter__(self):
+        return iter(METRICS)
+
+    def __len__(self):
+        return len(METRICS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class DailyStats(MutableMapping):
+    """Per-day metrics stored as one array per metric, indexed by day ordinal.
+
+    Row i holds the day with ordinal first + i, so a day costs a few bytes
+    per metric instead of a dict of boxed numbers. It behaves like the
+    defaultdict it replaces: keys are "%Y-%m-%d" strings, reading a missing
+    day creates an empty row, and each value is a DayStatsView whose items
+    write through to the columns. Days are iterated oldest first.
+
+    range_totals() answers any date range in O(1) from running totals per
+    metric. They are built on the first query and then kept up to date in
+    O(1) per change to the newest day; changing an older day (e.g. paging in
+    history) drops them until the next query.
+    """
+
+    def __init__(self, daily=None):
+        self.first = None   # ordinal of row 0
+        self.columns = {metric: array.array(TYPECODES[metric]) for metric in METRICS}
+        self.present = bytearray()  # 1 for days that have an entry
+        self.count = 0
+        self.prefix = None  # metric -> running totals; prefix[m][i] sums rows before i
+        if daily:
+            self.load(daily)
+
+    def load(self, daily):
+        """Fill from a {day: {metric: value}} dict"""
+        rows = {day_ordinal(day): stats for day, stats in daily.items()}
+        self.reserve(min(rows))
+        self.reserve(max(rows))
+        first, present = self.first, self.present
+        for metric, column in self.columns.items():
+            convert = float if column.typecode == "d" else int
+            for ordinal, stats in rows.items():
+                column[ordinal - first] = convert(stats.get(metric, 0))
+        for ordinal in rows:
+            if not present[ordinal - first]:
+                present[ordinal - first] = 1
+                self.count += 1
+        self.prefix = None
+
+    def reserve(self, ordinal):
+        """Grow the columns to cover a day and return its row index"""
+        if self.first is None:
+            self.first = ordinal
+        if ordinal < self.first:
+            grow = self.first - ordinal
+            for metric, column in self.columns.items():
+                self.columns[metric] = array.array(column.typecode, bytes(grow * column.itemsize)) + column
+            self.present = bytearray(grow) + self.present
+            self.first = ordinal
+            self.prefix = None
+        index = ordinal - self.first
+        if index >= len(self.present):
+            grow = index + 1 - len(self.present)
+            for column in self.columns.values():
+                column.frombytes(bytes(grow * column.itemsize))
+            self.present.extend(bytes(grow))
+            if self.prefix is not None:
+                for totals in self.prefix.values():
+                    totals.extend(itertools.repeat(totals[-1], grow))
+        return index
+
+    def create_row(self, ordinal):
+        index = self.reserve(ordinal)
+        if not self.present[index]:
+            self.present[index] = 1
+            self.count += 1
+        return DayStatsView(self, ordinal)
+
+    def index(self, day):
+        """Row index of a day key, or None if it has no entry"""
+        if self.first is None:
+            return None
+        index = day_ordinal(day) - self.first
+        if 0 <= index < len(self.present) and self.present[index]:
+            return index
+        return None
+
+    def __getitem__(self, day):
+        return self.create_row(day_ordinal(day))
+
+    def __setitem__(self, day, stats):
+        row = self.create_row(day_ordinal(day))
+        for metric in METRICS:
+            row[metric] = stats.get(metric, 0)
+
+    def __delitem__(self, day):
+        index = self.index(day)
+        if index is None:
+            raise KeyError(day)
+        for column in self.columns.values():
+            column[index] = 0
+        self.present[index] = 0
+        self.count -= 1
+        self.prefix = None
+
+    def __contains__(self, day):
+        return self.index(day) is not None
+
+    def get(self, day, default=None):
+        index = self.index(day)
+        return default if index is None else DayStatsView(self, self.first + index)
+
+    def __iter__(self):
+        first = self.first
+        for index, present in enumerate(self.present):
+            if present:
+                yield day_key(first + index)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.__init__()
+
+    def copy(self):
+        """Independent copy; only the column buffers are duplicated"""
+        other = DailyStats()
+        other.first = self.first
+        other.columns = {metric: column[:] for metric, column in self.columns.items()}
+        other.present = bytearray(self.present)
+        other.count = self.count
+        return other
+
+    def slice(self, start_day=None, stop_day=None):
+        """Copy of the days from start_day up to but not including stop_day"""
+        other = DailyStats()
+        if self.first is None:
+            return other
+        start = max(0, day_ordinal(start_day) - self.first) if start_day else 0
+        stop = max(start, day_ordinal(stop_day) - self.first) if stop_day else len(self.present)
+        other.first = self.first + start
+        other.columns = {metric: column[start:stop] for metric, column in self.columns.items()}
+        other.present = self.present[start:stop]
+        other.count = other.present.count(1)
+        return other
+
+    def build_prefix(self):
+        self.prefix = {
+            metric: array.array("d", itertools.accumulate(column, initial=0))
+            for metric, column in self.columns.items()
+        }
+
+    def range_totals(self, start_day, end_day):
+        """Metric totals from start_day to end_day inclusive, plus the number of calendar days"""
+        start, end = day_ordinal(start_day), day_ordinal(end_day)
+        totals = {"days": max(0, end - start + 1)}
+        if self.first is None:
+            totals.update((metric, 0) for metric in METRICS)
+            return totals
+        if self.prefix is None:
+            self.build_prefix()
+        rows = len(self.present)
+        low = min(max(start - self.first, 0), rows)
+        high = min(max(end - self.first + 1, 0), rows)
+        for metric, prefix in self.prefix.items():
+            total = prefix[high] - prefix[low] if high > low else 0
+            totals[metric] = total if metric == "productivity_score" else int(total)
+        return totals
+
+    def dump_columns(self):
+        """Raw column buffers, for binary snapshots"""
+        return {
+            "first": self.first,
+            "byteorder": sys.byteorder,
+            "present": bytes(self.present),
+            "columns": {metric: column.tobytes() for metric, column in self.columns.items()}
+        }
+
+    @classmethod
+    def from_columns(cls, dump):
+        """Rebuild from dump_columns() output without touching individual days"""
+        stats = cls()
+        stats.first = dump["first"]
+        stats.present = bytearray(dump["present"])
+        stats.count = stats.present.count(1)
+        for metric, column in stats.columns.items():
+            column.frombytes(dump["columns"][metric])
+            if dump["byteorder"] != sys.byteorder:
+                column.byteswap()
+        return stats
+
+    def column(self, metric):
+        """A copy of one metric's column, as a NumPy array when NumPy is installed"""
+        column = self.columns[metric]
+        if np is not None:
+            return np.array(column)
+        return column[:]
+
+    def to_dict(self):
+        return {day: dict(stats) for day, stats in self.items()}
+
+    def __repr__(self):
+        return f"DailyStats({len(self)} days)"
+
+
+def json_default(obj):
+    """json.dump hook that writes DailyStats as the plain dict it replaces"""
+    if isinstance(obj, DailyStats):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,159 @@
+"""
+Data export for Pomodoro Strike
+Streams daily statistics or logged sessions to CSV or JSON Lines on a
+background thread, in bounded chunks
+"""
+
+import csv
+import itertools
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from daily_stats import METRICS, day_key
+from session_log import MAGIC, RECORD
+
+FORMATS = ("csv", "jsonl")
+
+METRIC_LABELS = {
+    "focus_sessions": "Focus Sessions",
+    "focus_time": "Focus Time (min)",
+    "tasks_completed": "Tasks Completed",
+    "productivity_score": "Productivity Score"
+}
+
+SESSION_FIELDS = ("start", "end", "kind", "planned_seconds", "pause_count", "paused_seconds", "task_id")
+SESSION_LABELS = ("Start", "End", "Kind", "Planned (s)", "Pauses", "Paused (s)", "Task ID")
+
+
+def daily_rows(daily_stats, metrics=METRICS):
+    """(day, value, ...) for every day with an entry, oldest first.
+
+    Reads the columns directly, so pass a copy (e.g. a slice) that the app
+    will not grow while the export runs.
+    """
+    columns = [daily_stats.columns[metric] for metric in metrics]
+    scores = [metric == "productivity_score" for metric in metrics]
+    first = daily_stats.first
+    for index, present in enumerate(daily_stats.present):
+        if present:
+            yield (day_key(first + index), *(
+                round(column[index], 1) if score else column[index]
+                for column, score in zip(columns, scores)
+            ))
+
+
+def session_rows(records, start_day=None, end_day=None):
+    """One row per logged session whose end falls between two days (inclusive)"""
+    low = datetime.fromisoformat(start_day).timestamp() if start_day else float("-inf")
+    high = (datetime.fromisoformat(end_day) + timedelta(days=1)).timestamp() if end_day else float("inf")
+    for record in records:
+        if low <= record.end < high:
+            yield (
+                datetime.fromtimestamp(record.start).isoformat(timespec="seconds"),
+                datetime.fromtimestamp(record.end).isoformat(timespec="seconds"),
+                record.kind, record.planned, record.pause_count, record.paused, record.task_id
+            )
+
+
+def session_count(path):
+    """Number of complete records in a session log file, without reading it"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    return max(0, size - len(MAGIC)) // RECORD.size
+
+
+class ExportJob:
+    """Writes rows from a generator to a file on a background thread.
+
+    Rows are pulled chunk_size at a time, so memory stays flat however long
+    the history is. The file is written next to its destination and moved
+    into place when complete, so a failed or cancelled export leaves nothing
+    behind. The owner polls progress(), done and error from the Tk thread.
+
+    total is the number of source items expected. When the rows are filtered
+    from a larger stream, wrap that stream in counted() so progress follows
+    the items read rather than the rows written.
+    """
+
+    def __init__(self, path, fields, labels, fmt="csv", total=0, footer=(), chunk_size=500):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.path = path
+        self.rows = None
+        self.fields = fields    # JSON keys
+        self.labels = labels    # CSV header
+        self.fmt = fmt
+        self.total = total      # expected number of rows read, for progress
+        self.footer = footer    # extra CSV rows written after a blank line
+        self.chunk_size = chunk_size
+        self.read = 0
+        self.written = 0
+        self.done = False
+        self.error = None
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self, rows):
+        self.rows = rows
+        self.thread.start()
+        return self
+
+    def counted(self, items):
+        """Pass items through, counting them as read"""
+        for item in items:
+            self.read += 1
+            yield item
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def progress(self):
+        """Fraction of the expected rows processed so far"""
+        if self.done:
+            return 1.0
+        return min(self.read / self.total, 1.0) if self.total else 0.0
+
+    def _run(self):
+        temp_path = f"{self.path}.part"
+        try:
+            with open(temp_path, "w", newline="", encoding="utf-8") as f:
+                if self.fmt == "csv":
+                    writer = csv.writer(f)
+                    writer.writerow(self.labels)
+                    write_chunk = writer.writerows
+                else:
+                    def write_chunk(chunk, fields=self.fields):
+                        f.write("".join(json.dumps(dict(zip(fields, row))) + "\n" for row in chunk))
+
+                rows = iter(self.rows)
+                while not self.cancelled.is_set():
+                    chunk = list(itertools.islice(rows, self.chunk_size))
+                    if not chunk:
+                        break
+                    write_chunk(chunk)
+                    self.written += len(chunk)
+                    self.read = max(self.read, self.written)
+
+                if self.fmt == "csv" and self.footer:
+                    writer.writerow([])
+                    writer.writerows(self.footer)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if self.cancelled.is_set():
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            self.error = e
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        finally:
+            self.done = True
+
@@ -0,0 +1,149 @@
+"""
+Process coordination for Pomodoro Strike
+Advisory file locks and single-instance handoff for a shared data directory
+"""
+
+import os
+import socket
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def _lock_file(f, blocking):
+    """Take an exclusive OS lock on an open file; returns False if busy and not blocking"""
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        except BlockingIOError:
+            return False
+
+    # msvcrt locks a byte range from the current position
+    while True:
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.01)
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Exclusive advisory lock on a lock file (fcntl on POSIX, msvcrt on Windows).
+
+    Excludes other processes and, through a re-entrant thread lock, other
+    threads of this process. The OS drops the lock if the process dies.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.file = None
+        self.depth = 0
+
+    def acquire(self, blocking=True):
+        if not self.thread_lock.acquire(blocking):
+            return False
+        if self.depth == 0:
+            try:
+                self.file = open(self.path, "a+b")
+                if not _lock_file(self.file, blocking):
+                    self.file.close()
+                    self.file = None
+                    self.thread_lock.release()
+                    return False
+            except BaseException:
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+        return True
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            try:
+                _unlock_file(self.file)
+            finally:
+                self.file.close()
+                self.file = None
+        self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class SingleInstance:
+    """Lets one process own the data directory for its whole lifetime.
+
+    The owner holds lock_path and listens on a loopback port recorded next to
+    it. A later launch that cannot take the lock calls activate_running() to
+    ask the owner to show its window, then exits without touching the data.
+    """
+
+    def __init__(self, lock_path):
+        self.lock = FileLock(lock_path)
+        self.port_path = os.path.splitext(lock_path)[0] + ".port"
+        self.server = None
+
+    def acquire(self):
+        """Become the owning instance; False if another process already is"""
+        return self.lock.acquire(blocking=False)
+
+    def listen(self, on_activate):
+        """Call on_activate (from a background thread) whenever another launch hands off"""
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(5)
+        temp_path = f"{self.port_path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(str(self.server.getsockname()[1]))
+        os.replace(temp_path, self.port_path)
+        threading.Thread(target=self._serve, args=(on_activate,), daemon=True).start()
+
+    def _serve(self, on_activate):
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            with connection:
+                connection.settimeout(2)
+                try:
+                    if connection.recv(16).startswith(b"activate"):
+                        on_activate()
+                except OSError:
+                    pass
+
+    def activate_running(self):
+        """Ask the owning instance to show its window; False if it could not be reached"""
+        try:
+            with open(self.port_path, "r") as f:
+                port = int(f.read().strip())
+            with socket.create_connection(("127.0.0.1", port), timeout=2) as connection:
+                connection.sendall(b"activate\n")
+            return True
+        except (OSError, ValueError):
+            return False
@@ -8,7 +8,7 @@ import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 import winsound
 import platform
 from PIL import Image, ImageTk, ImageDraw
@@ -16,10 +16,23 @@ import pystray
 from pystray import MenuItem as item
 import math
 import random
-import csv
-from collections import defaultdict
+import bisect
+from collections import defaultdict, deque
 from CTkToolTip import *
 import sys
+from timer_engine import TimerController, PomodoroEngine
+from todo_store import TodoStore
+from storage import TodoJournal, WriteBehindFile, PersistenceWorker, YearlyHistoryArchive
+from sqlite_store import SQLiteStore
+from session_log import SessionLog, RollupMaterializer, session_record, empty_focus_matrix
+from daily_stats import DailyStats, METRICS, day_key, json_default
+from state_snapshot import read_snapshot, write_snapshot
+from instance_lock import FileLock, SingleInstance
+from analytics import FocusAnalytics, WEEKDAYS
+from export import (
+    ExportJob, FORMATS, METRIC_LABELS, SESSION_FIELDS, SESSION_LABELS,
+    daily_rows, session_rows, session_count
+)
 
 # Update system imports
 try:
@@ -69,6 +82,24 @@ POMODORO_TIPS = [
     "Review your completed sessions regularly"
 ]
 
+# Progress ring animation frame rates (0 draws a static ring)
+RING_ANIMATION_FRAME_RATES = {
+    "Smooth": 30,
+    "Normal": 20,
+    "Low Power": 5,
+    "Static Ring": 0
+}
+
+# Days of daily stats loaded at startup; older days are paged in on demand
+RECENT_HISTORY_DAYS = 90
+
+# Progress ring color for each timer mode
+MODE_RING_COLORS = {
+    "pomodoro": "#3498db",     # Blue for focus
+    "short_break": "#2ecc71",  # Green for short break
+    "long_break": "#9b59b6"    # Purple for long break
+}
+
 class ProductivityData:
     def __init__(self):
         self.focus_streak = 0
@@ -79,12 +110,7 @@ class ProductivityData:
             "tasks_completed": 5
         }
         self.achievements = []
-        self.daily_stats = defaultdict(lambda: {
-            "focus_sessions": 0,
-            "focus_time": 0,
-            "tasks_completed": 0,
-            "productivity_score": 0.0
-        })
+        self.daily_stats = DailyStats()
         self.weekly_stats = defaultdict(lambda: {
             "focus_sessions": 0,
             "focus_time": 0,
@@ -98,8 +124,32 @@ class ProductivityData:
             "productivity_score": 0.0
         })
         self.best_hours = defaultdict(int)
+        self.focus_matrix = empty_focus_matrix()  # focus minutes per [weekday][hour]
         self.session_completion_rates = []
         
+        # Stats are derived from the session log
+        self.rollups = RollupMaterializer(self)
+        
+        # Older daily stats stay on disk until load_history() asks for them
+        self.history_loader = None  # callable(since, before) returning {day: stats}
+        self.history_before = None  # days before this "%Y-%m-%d" key are not loaded yet
+        self.window_start = None    # first day kept in productivity_data.json
+        
+    def recent_window_start(self):
+        """First day of the window that is always kept in memory"""
+        return (datetime.now() - timedelta(days=RECENT_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        
+    def load_history(self, since=None):
+        """Page in daily stats older than the recent window, all of them or from since onwards"""
+        if self.history_before is None or self.history_loader is None:
+            return
+        if since is not None and since >= self.history_before:
+            return
+        days = self.history_loader(since, self.history_before)
+        if days:
+            self.daily_stats.load(days)
+        self.history_before = since
+        
     def update_focus_streak(self, completed_session: bool):
         """Update focus streak based on session completion"""
         if completed_session:
@@ -122,35 +172,39 @@ class ProductivityData:
         
         return time_score + task_score + session_score
         
-    def update_daily_stats(self, focus_time: int, tasks_completed: int = 0):
-        """Update daily statistics"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        self.daily_stats[today]["focus_time"] += focus_time
-        self.daily_stats[today]["focus_sessions"] += 1
-        self.daily_stats[today]["tasks_completed"] += tasks_completed
-        
-        # Calculate productivity score
-        self.daily_stats[today]["productivity_score"] = float(self.calculate_productivity_score(
-            int(self.daily_stats[today]["focus_time"]),
-            int(self.daily_stats[today]["tasks_completed"]),
-            int(self.daily_stats[today]["focus_sessions"])
-        ))
-        
-        # Update weekly and monthly stats
-        week_key = datetime.now().strftime("%Y-W%U")
-        month_key = datetime.now().strftime("%Y-%m")
-        
-        self.weekly_stats[week_key]["focus_time"] += focus_time
-        self.weekly_stats[week_key]["focus_sessions"] += 1
-        self.weekly_stats[week_key]["tasks_completed"] += tasks_completed
+    def record_session(self, record):
+        """Fold a logged session or completed task into the daily, weekly, monthly and hourly stats"""
+        self.rollups.apply(record)
         
-        self.monthly_stats[month_key]["focus_time"] += focus_time
-        self.monthly_stats[month_key]["focus_sessions"] += 1
-        self.monthly_stats[month_key]["tasks_completed"] += tasks_completed
-        
-        # Update best hours
-        current_hour = datetime.now().hour
-        self.best_hours[current_hour] += 1
+    def snapshot(self):
+        """Copy of the data for saving, cheap enough for the UI thread.
+
+        Daily stats before window_start live in the yearly history files, so
+        only the window's columns are copied, as flat buffers. record_session only
+        mutates the weekly and monthly entries for the current week and month,
+        so those are copied and every older entry is shared.
+        """
+        now = datetime.now()
+        current = {
+            "weekly_stats": now.strftime("%Y-W%U"),
+            "monthly_stats": now.strftime("%Y-%m")
+        }
+        data = {
+            "focus_streak": self.focus_streak,
+            "longest_streak": self.longest_streak,
+            "daily_goals": dict(self.daily_goals),
+            "achievements": list(self.achievements),
+            "daily_stats": self.daily_stats.slice(self.window_start),
+            "history_before": self.window_start,
+            "best_hours": dict(self.best_hours),
+            "focus_matrix": [row[:] for row in self.focus_matrix]
+        }
+        for name, key in current.items():
+            stats = dict(getattr(self, name))
+            if key in stats:
+                stats[key] = dict(stats[key])
+            data[name] = stats
+        return data
         
     def check_achievements(self):
         """Check and award achievements"""
@@ -184,6 +238,24 @@ class ProgressRing(ctk.CTkFrame):
         self.ring_width = 15
         self.animation_step = 0
         self.glow_color = "#3498db"  # Default to focus blue
+        self.num_glow_layers = 15
+        
+        # Animation governor
+        self.frame_rate = 20
+        self.animation_job = None
+        self.suspend_reasons = set()  # e.g. "hidden", "minimized"
+        self.frames_rendered = 0
+        
+        # Canvas items are created once and then updated in place
+        self.glow_items = []
+        self.background_arc = None
+        self.progress_arc = None
+        self.last_pulse_factor = None
+        self.last_progress_extent = None
+        
+        # Glow layer colors keyed by (background, glow color, appearance mode)
+        self.glow_palette_cache = {}
+        self.glow_palette = []
         
         # Create canvas for the ring
         self.canvas = tk.Canvas(
@@ -200,81 +272,170 @@ class ProgressRing(ctk.CTkFrame):
         self.radius = (size - self.ring_width * 2) // 2
         
         # Draw initial ring
+        self.create_ring_items()
+        self.refresh_glow_palette()
         self.draw_ring()
         self.animate_glow()
         
-    def draw_ring(self):
-        """Draw the progress ring"""
-        self.canvas.delete("all")
-        
-        # Pulsating glow effect
-        self.draw_pulsating_glow()
-        
-        # Background ring
-        self.canvas.create_arc(
+    def create_ring_items(self):
+        """Create the canvas items for the glow, background ring and progress ring"""
+        ring_bbox = (
             self.center - self.radius,
             self.center - self.radius,
             self.center + self.radius,
-            self.center + self.radius,
+            self.center + self.radius
+        )
+        
+        # Glow layers sit underneath the rings
+        self.glow_items = [
+            self.canvas.create_oval(*ring_bbox, width=2)
+            for _ in range(self.num_glow_layers)
+        ]
+        
+        # Background ring
+        self.background_arc = self.canvas.create_arc(
+            *ring_bbox,
             start=0,
             extent=360,
             width=self.ring_width,
-            outline=self._apply_appearance_mode(("gray70", "gray30")),
             style="arc"
         )
         
         # Progress ring
-        if self.progress > 0:
-            extent = self.progress * 360
-            self.canvas.create_arc(
-                self.center - self.radius,
-                self.center - self.radius,
-                self.center + self.radius,
-                self.center + self.radius,
-                start=90,  # Start from top
-                extent=-extent,
-                width=self.ring_width,
-                outline=self.glow_color,
-                style="arc"
-            )
+        self.progress_arc = self.canvas.create_arc(
+            *ring_bbox,
+            start=90,  # Start from top
+            extent=0,
+            width=self.ring_width,
+            style="arc",
+            state="hidden"
+        )
+        
+    def draw_ring(self):
+        """Refresh every ring item, e.g. after a color or theme change"""
+        self.canvas.itemconfigure(self.background_arc, outline=self._apply_appearance_mode(("gray70", "gray30")))
+        self.canvas.itemconfigure(self.progress_arc, outline=self.glow_color)
+        
+        for glow_item, glow_color in zip(self.glow_items, self.glow_palette):
+            self.canvas.itemconfigure(glow_item, outline=glow_color)
+            
+        self.last_pulse_factor = None
+        self.last_progress_extent = None
+        self.draw_pulsating_glow()
+        self.draw_progress()
+        
+    def draw_progress(self):
+        """Update the progress arc if its extent changed"""
+        extent = round(self.progress * 360, 1)
+        if extent == self.last_progress_extent:
+            return
+        self.last_progress_extent = extent
+        
+        if extent > 0:
+            self.canvas.itemconfigure(self.progress_arc, extent=-extent, state="normal")
+        else:
+            self.canvas.itemconfigure(self.progress_arc, state="hidden")
             
     def draw_pulsating_glow(self):
-        """Draw a pulsating glow effect"""
+        """Move the glow layers for the current animation step"""
         pulse_factor = (math.sin(math.radians(self.animation_step)) + 1) / 2  # Varies between 0 and 1
-        num_layers = 15
+        pulse_factor = round(pulse_factor, 3)
+        if pulse_factor == self.last_pulse_factor:
+            return
+        self.last_pulse_factor = pulse_factor
+        
+        self.frames_rendered += 1
         
-        for i in range(num_layers):
+        # The innermost layer never moves
+        for i, glow_item in enumerate(self.glow_items[1:], start=1):
             radius = self.radius + (i * 2) * pulse_factor
-            alpha = 1 - (i / num_layers)
-            
-            # Create a transparent color for the glow
-            glow_color = self.interpolate_color(self._apply_appearance_mode(self._fg_color), self.glow_color, 0.1 * alpha)
-            
-            self.canvas.create_oval(
+            self.canvas.coords(
+                glow_item,
                 self.center - radius,
                 self.center - radius,
                 self.center + radius,
-                self.center + radius,
-                outline=glow_color,
-                width=2
+                self.center + radius
             )
 
     def animate_glow(self):
         """Animate the glow effect"""
-        self.animation_step += 2
-        self.draw_ring()
-        self.after(50, self.animate_glow)
+        self.animation_job = None
+        if self.suspend_reasons or self.frame_rate <= 0:
+            return
+            
+        # Keep the pulse speed the same at any frame rate (40 degrees per second)
+        self.animation_step += 40 / self.frame_rate
+        self.draw_pulsating_glow()
+        self.schedule_animation()
+        
+    def schedule_animation(self):
+        """Queue the next animation frame unless animation is suspended or static"""
+        if self.animation_job is None and not self.suspend_reasons and self.frame_rate > 0:
+            self.animation_job = self.after(int(1000 / self.frame_rate), self.animate_glow)
+            
+    def cancel_animation(self):
+        if self.animation_job is not None:
+            self.after_cancel(self.animation_job)
+            self.animation_job = None
+            
+    def set_frame_rate(self, frame_rate):
+        """Set the glow frame rate; 0 stops the animation and draws a static ring"""
+        self.frame_rate = max(0, frame_rate)
+        self.cancel_animation()
+        if self.frame_rate == 0:
+            self.animation_step = 0
+            self.draw_pulsating_glow()
+        self.schedule_animation()
+        
+    def suspend_animation(self, reason):
+        """Stop animating while the ring cannot be seen"""
+        self.suspend_reasons.add(reason)
+        self.cancel_animation()
+        
+    def resume_animation(self, reason):
+        """Resume animating once nothing is keeping the ring hidden"""
+        self.suspend_reasons.discard(reason)
+        self.schedule_animation()
         
     def set_color(self, color):
         """Set the color of the progress ring and glow"""
+        if color == self.glow_color:
+            return
         self.glow_color = color
+        self.refresh_glow_palette()
         self.draw_ring()
         
+    def apply_theme(self):
+        """Redraw the ring after the appearance mode or theme changed"""
+        self.refresh_glow_palette()
+        self.draw_ring()
+        
+    def refresh_glow_palette(self):
+        """Look up or precompute the glow layer colors for the current colors"""
+        background = self._apply_appearance_mode(self._fg_color)
+        key = (background, self.glow_color, ctk.get_appearance_mode())
+        
+        palette = self.glow_palette_cache.get(key)
+        if palette is None:
+            c1 = self.winfo_rgb(background)
+            c2 = self.winfo_rgb(self.glow_color)
+            palette = []
+            for i in range(self.num_glow_layers):
+                alpha = 1 - (i / self.num_glow_layers)
+                
+                # Create a transparent color for the glow
+                palette.append(self.blend_rgb(c1, c2, 0.1 * alpha))
+            self.glow_palette_cache[key] = palette
+            
+        self.glow_palette = palette
+        
     def interpolate_color(self, color1, color2, factor):
         """Interpolate between two hex colors"""
-        c1 = self.winfo_rgb(color1)
-        c2 = self.winfo_rgb(color2)
+        return self.blend_rgb(self.winfo_rgb(color1), self.winfo_rgb(color2), factor)
         
+    @staticmethod
+    def blend_rgb(c1, c2, factor):
+        """Blend two 16-bit RGB tuples from winfo_rgb into a hex color"""
         r = int(c1[0] + (c2[0] - c1[0]) * factor)
         g = int(c1[1] + (c2[1] - c1[1]) * factor)
         b = int(c1[2] + (c2[2] - c1[2]) * factor)
@@ -284,7 +445,7 @@ class ProgressRing(ctk.CTkFrame):
     def set_progress(self, progress):
         """Set progress (0.0 to 1.0)"""
         self.progress = max(0.0, min(1.0, progress))
-        self.draw_ring()
+        self.draw_progress()
         
     def _apply_appearance_mode(self, color_tuple):
         """Apply appearance mode to colors"""
@@ -293,6 +454,62 @@ class ProgressRing(ctk.CTkFrame):
         else:
             return color_tuple[0]
 
+class UIUpdateDispatcher:
+    """Coalesces UI updates into at most one flush per frame on the Tk main thread.
+
+    Any thread may mark state dirty, but only the main thread touches widgets:
+    worker threads never queue Tk callbacks. The dispatcher polls once per frame
+    while keep_alive() is true (e.g. while the timer runs); otherwise frames are
+    only scheduled when the main thread marks something dirty.
+    """
+    def __init__(self, widget, frame_interval=50, keep_alive=None):
+        self.widget = widget
+        self.frame_interval = frame_interval  # ms
+        self.keep_alive = keep_alive
+        self.handlers = {}  # flag -> callback, flushed in registration order
+        self.dirty = set()
+        self.lock = threading.Lock()
+        self.job = None
+        self.frames_flushed = 0
+        
+    def register(self, flag, handler):
+        """Register the callback that brings the UI up to date for a flag"""
+        self.handlers[flag] = handler
+        
+    def mark_dirty(self, *flags):
+        """Mark state as changed; safe to call from any thread"""
+        with self.lock:
+            self.dirty.update(flags)
+        if threading.current_thread() is threading.main_thread():
+            self.schedule(0)
+            
+    def schedule(self, delay=None):
+        """Queue a frame if none is pending (main thread only)"""
+        if self.job is None:
+            self.job = self.widget.after(self.frame_interval if delay is None else delay, self.flush)
+            
+    def flush(self):
+        """Run the handler of every dirty flag once"""
+        self.job = None
+        flushed = False
+        
+        # Handlers run in registration order, so one may dirty a later flag in the same frame
+        for flag, handler in self.handlers.items():
+            with self.lock:
+                if flag not in self.dirty:
+                    continue
+                self.dirty.discard(flag)
+            handler()
+            flushed = True
+            
+        if flushed:
+            self.frames_flushed += 1
+            
+        with self.lock:
+            pending = bool(self.dirty)
+        if pending or (self.keep_alive and self.keep_alive()):
+            self.schedule()
+
 class TodoItem:
     def __init__(self, text: str, completed: bool = False, created_at: Optional[str] = None, 
                  category: str = "General", priority: str = "Medium", due_date: Optional[str] = None):
@@ -305,6 +522,310 @@ class TodoItem:
         self.due_date = due_date
         self.estimated_time = 0  # in minutes
         self.actual_time = 0     # in minutes
+        
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "text": self.text,
+            "completed": self.completed,
+            "created_at": self.created_at,
+            "category": self.category,
+            "priority": self.priority,
+            "due_date": self.due_date,
+            "estimated_time": self.estimated_time,
+            "actual_time": self.actual_time
+        }
+        
+    @classmethod
+    def from_dict(cls, todo_data):
+        todo = cls(
+            todo_data["text"],
+            todo_data["completed"],
+            todo_data["created_at"],
+            todo_data["category"],
+            todo_data["priority"],
+            todo_data["due_date"]
+        )
+        todo.id = todo_data["id"]
+        todo.estimated_time = todo_data["estimated_time"]
+        todo.actual_time = todo_data["actual_time"]
+        return todo
+
+class TodoRow(ctk.CTkFrame):
+    """A reusable task row; bind_todo() points it at another todo without rebuilding it"""
+    TEXT_WRAP_LENGTH = 200
+    TEXT_LABEL_HEIGHT = 28  # CTkLabel default; longer text grows the row beyond it
+    
+    def __init__(self, master, app, **kwargs):
+        super().__init__(master, **kwargs)
+        self.app = app
+        self.todo_id = None
+        self.placement = None  # (y, height) the row was last placed at
+        
+        # Main content frame
+        content_frame = ctk.CTkFrame(self)
+        content_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        # Top row: checkbox, text, delete button
+        top_row = ctk.CTkFrame(content_frame)
+        top_row.pack(fill="x", pady=2)
+        
+        # Checkbox
+        self.completed_var = ctk.BooleanVar(value=False)
+        self.checkbox = ctk.CTkCheckBox(
+            top_row,
+            text="",
+            variable=self.completed_var,
+            command=lambda: self.app.toggle_todo(self.todo_id, self.completed_var)
+        )
+        self.checkbox.pack(side="left", padx=(5, 5), pady=5)
+        
+        # Todo text
+        self.text_label = ctk.CTkLabel(
+            top_row,
+            text="",
+            anchor="w",
+            wraplength=self.TEXT_WRAP_LENGTH
+        )
+        self.text_label.pack(side="left", fill="x", expand=True, padx=(0, 5), pady=5)
+        
+        # Delete button
+        self.delete_btn = ctk.CTkButton(
+            top_row,
+            text="✕",
+            width=25,
+            height=25,
+            command=lambda: self.app.delete_todo(self.todo_id)
+        )
+        self.delete_btn.pack(side="right", padx=(0, 5), pady=5)
+        
+        # Bottom row: metadata, only shown for open tasks
+        self.meta_row = ctk.CTkFrame(content_frame)
+        
+        # Category badge
+        self.category_label = ctk.CTkLabel(
+            self.meta_row,
+            text="",
+            font=ctk.CTkFont(size=10),
+            corner_radius=10,
+            width=60
+        )
+        self.category_label.pack(side="left", padx=(5, 2), pady=2)
+        
+        # Priority badge
+        self.priority_label = ctk.CTkLabel(
+            self.meta_row,
+            text="",
+            font=ctk.CTkFont(size=10),
+            corner_radius=10,
+            width=50
+        )
+        self.priority_label.pack(side="left", padx=2, pady=2)
+        
+        # Due date
+        self.due_date_label = ctk.CTkLabel(self.meta_row, text="", font=ctk.CTkFont(size=10))
+        
+        # Estimated time
+        self.time_label = ctk.CTkLabel(
+            self.meta_row,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color="gray"
+        )
+        
+    def bind_todo(self, todo):
+        """Show a todo in this row"""
+        self.todo_id = todo.id
+        self.completed_var.set(todo.completed)
+        self.text_label.configure(text=todo.text, text_color="gray" if todo.completed else "white")
+        
+        if todo.completed:
+            self.meta_row.pack_forget()
+            return
+            
+        self.meta_row.pack(fill="x", pady=2)
+        self.category_label.configure(text=todo.category, fg_color=self.app.get_category_color(todo.category))
+        self.priority_label.configure(text=todo.priority, fg_color=self.app.get_priority_color(todo.priority))
+        
+        if todo.due_date:
+            self.due_date_label.configure(
+                text=f"Due: {todo.due_date}",
+                text_color=self.app.get_due_date_color(todo.due_date)
+            )
+            self.due_date_label.pack(side="left", padx=(10, 2), pady=2)
+        else:
+            self.due_date_label.pack_forget()
+            
+        if todo.estimated_time > 0:
+            self.time_label.configure(text=f"Est: {todo.estimated_time}m")
+            self.time_label.pack(side="right", padx=(2, 5), pady=2)
+        else:
+            self.time_label.pack_forget()
+
+class VirtualTodoList(ctk.CTkFrame):
+    """Scrollable, sorted task list that only creates widgets for the rows in view.
+
+    A small pool of TodoRow widgets is re-bound to whichever todos are visible,
+    plus a few rows of overscan, so the widget count depends on the window
+    height rather than on the number of tasks. The todos and their order come
+    from a TodoStore. Rows are keyed by todo id: insert_item, remove_item and
+    update_item patch a single row after the store changed, and only re-place
+    the visible rows around it. Row heights come from how many lines the
+    task text wraps to, measured with font metrics rather than widgets.
+    """
+    COMPLETED_ROW_HEIGHT = 56   # with the text on one line
+    OPEN_ROW_HEIGHT = 92
+    
+    def __init__(self, master, app, store, overscan=3, **kwargs):
+        super().__init__(master, **kwargs)
+        self.app = app
+        self.store = store
+        self.overscan = overscan
+        self.offsets = [0]        # top of each row, plus the total height at the end
+        self.scroll_y = 0
+        self.visible_rows = {}    # todo id -> TodoRow
+        self.pool = []            # rows that are not showing anything
+        self.rows_created = 0
+        self.text_font = ctk.CTkFont()  # the font TodoRow.text_label uses
+        self.line_height = self.text_font.metrics("linespace")
+        self.text_lines = {}      # task text -> number of wrapped lines
+        
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.viewport.bind("<Configure>", lambda e: self.redraw())
+        
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        # Wheel events anywhere in the window scroll the list
+        toplevel = self.winfo_toplevel()
+        toplevel.bind("<MouseWheel>", self.on_mousewheel, add="+")
+        toplevel.bind("<Button-4>", lambda e: self.scroll_by(-40), add="+")
+        toplevel.bind("<Button-5>", lambda e: self.scroll_by(40), add="+")
+        
+    def row_height(self, todo):
+        height = self.COMPLETED_ROW_HEIGHT if todo.completed else self.OPEN_ROW_HEIGHT
+        lines = self.text_lines.get(todo.text)
+        if lines is None:
+            lines = self.text_lines[todo.text] = self.count_text_lines(todo.text)
+        text_height = lines * self.line_height
+        return height + max(0, text_height - TodoRow.TEXT_LABEL_HEIGHT)
+        
+    def count_text_lines(self, text):
+        """Lines Tk wraps a task text to: at spaces, or mid-word for words longer than a line"""
+        font, width = self.text_font, TodoRow.TEXT_WRAP_LENGTH
+        space = font.measure(" ")
+        lines = 0
+        for paragraph in text.split("\n"):
+            lines += 1
+            if font.measure(paragraph) <= width:
+                continue
+            line_width = 0
+            for word in paragraph.split(" "):
+                word_width = font.measure(word)
+                if line_width and line_width + space + word_width > width:
+                    lines += 1
+                    line_width = 0
+                line_width += (space if line_width else 0) + word_width
+                while line_width > width:
+                    lines += 1
+                    line_width -= width
+        return lines
+        
+    def refresh(self):
+        """Re-read the whole store; rows of todos that stay in view are kept as they are"""
+        self.update_offsets(0)
+        self.redraw()
+        
+    def insert_item(self, todo):
+        """Show a todo that was just added to the store"""
+        self.update_offsets(self.store.index_of(todo.id))
+        self.redraw()
+        
+    def remove_item(self, index):
+        """Drop the row of a todo that was just removed from position index of the store"""
+        self.update_offsets(index)
+        self.redraw()
+        
+    def update_item(self, todo, old_index):
+        """Restyle one todo's row and move it from old_index to its new store position"""
+        self.update_offsets(min(old_index, self.store.index_of(todo.id)))
+        
+        row = self.visible_rows.get(todo.id)
+        if row is not None:
+            row.bind_todo(todo)
+        self.redraw()
+        
+    def update_offsets(self, start):
+        """Recompute row offsets from a given position onwards"""
+        del self.offsets[start + 1:]
+        for todo in self.store.sorted(start):
+            self.offsets.append(self.offsets[-1] + self.row_height(todo))
+        
+    def visible_range(self):
+        """Indices of the rows that intersect the viewport, widened by the overscan"""
+        height = self.viewport.winfo_height()
+        first = bisect.bisect_right(self.offsets, self.scroll_y) - 1
+        last = bisect.bisect_left(self.offsets, self.scroll_y + height)
+        return max(0, first - self.overscan), min(len(self.store), last + self.overscan)
+        
+    def redraw(self):
+        """Place rows for the current scroll position, reusing rows that stay in view"""
+        height = self.viewport.winfo_height()
+        total = self.offsets[-1]
+        self.scroll_y = max(0, min(self.scroll_y, total - height))
+        start, end = self.visible_range()
+        wanted = {todo.id: index for index, todo in enumerate(self.store.sorted(start, end), start)}
+        
+        for todo_id in [t for t in self.visible_rows if t not in wanted]:
+            row = self.visible_rows.pop(todo_id)
+            row.place_forget()
+            row.placement = None
+            self.pool.append(row)
+            
+        for todo_id, index in wanted.items():
+            row = self.visible_rows.get(todo_id)
+            if row is None:
+                row = self.acquire_row()
+                row.bind_todo(self.store.todo_at(index))
+                self.visible_rows[todo_id] = row
+                
+            # Rows that did not move are left alone
+            placement = (self.offsets[index] - self.scroll_y, self.offsets[index + 1] - self.offsets[index] - 4)
+            if row.placement != placement:
+                row.place(x=0, y=placement[0], relwidth=1.0, height=placement[1])
+                row.placement = placement
+            
+        if total > height:
+            self.scrollbar.set(self.scroll_y / total, (self.scroll_y + height) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            
+    def acquire_row(self):
+        if self.pool:
+            return self.pool.pop()
+        self.rows_created += 1
+        return TodoRow(self.viewport, self.app)
+        
+    def scroll_by(self, pixels):
+        self.scroll_y += pixels
+        self.redraw()
+        
+    def on_mousewheel(self, event):
+        self.scroll_by(-int(event.delta / 120 * 40))
+        
+    def on_scrollbar(self, action, *args):
+        """Handle scrollbar drags (moveto) and arrow/page clicks (scroll)"""
+        height = self.viewport.winfo_height()
+        if action == "moveto":
+            self.scroll_y = float(args[0]) * self.offsets[-1]
+        elif action == "scroll":
+            amount = int(args[0])
+            self.scroll_y += amount * (height if args[1] == "pages" else 40)
+        self.redraw()
 
 class PomodoroStrike(ctk.CTk):
     def __init__(self):
@@ -335,16 +856,23 @@ class PomodoroStrike(ctk.CTk):
         except Exception as e:
             print(f"Failed to set app icon: {e}")
         
-        # Initialize state
-        self.mode = "pomodoro"
-        self.is_running = False
-        self.is_paused = False
-        self.time_left = 25 * 60  # 25 minutes in seconds
-        self.total_time = 25 * 60
-        self.sessions = 0
+        # Initialize state (timer state lives in self.engine, created once settings are loaded)
+        self.engine = None
         self.total_focus_time = 0
-        self.timer_thread = None
-        self.stop_timer = False
+        self.timer = TimerController(on_tick=self.on_timer_tick, on_complete=self.on_timer_complete)
+        self.pending_timer_tick = None      # (generation, seconds_left) from the timer thread
+        self.pending_timer_complete = None  # generation from the timer thread
+        self.activation_requested = threading.Event()  # set when another launch hands off to us
+        self.timer_drifts = deque(maxlen=100)  # drift reports of recently completed sessions
+        
+        # All UI refreshes are batched into one flush per frame
+        self.ui_updates = UIUpdateDispatcher(self, keep_alive=lambda: self.is_running and not self.is_paused)
+        self.ui_updates.register("timer_tick", self.apply_timer_tick)
+        self.ui_updates.register("timer_complete", self.apply_timer_complete)
+        self.ui_updates.register("color", self.update_ring_color)
+        self.ui_updates.register("time_text", self.update_time_text)
+        self.ui_updates.register("progress", self.update_progress_ring)
+        self.ui_updates.register("sidebar_stats", self.update_sidebar_stats)
         
         # UI state
         self.is_fullscreen = True
@@ -355,6 +883,8 @@ class PomodoroStrike(ctk.CTk):
         
         # Productivity data
         self.productivity_data = ProductivityData()
+        self.stats_range = None  # (start, end) day keys picked in the Statistics tab
+        self.export_job = None
         
         # Update system
         if UPDATE_SYSTEM_AVAILABLE:
@@ -384,11 +914,37 @@ class PomodoroStrike(ctk.CTk):
             "auto_pause_idle": False,
             "idle_threshold": 300,  # 5 minutes
             "show_motivational_quotes": True,
-            "show_pomodoro_tips": True
+            "show_pomodoro_tips": True,
+            "ring_animation": "Normal",  # key of RING_ANIMATION_FRAME_RATES
+            "storage_backend": "json"    # "json" files or one "sqlite" database
         }
         
-        # Todo list
-        self.todos: List[TodoItem] = []
+        # Todo list, indexed by id and kept in display order
+        self.todos = TodoStore()
+        self.todo_journal = TodoJournal(
+            get_data_path("todos.json"),
+            get_data_path("todos.journal"),
+            lock=FileLock(get_data_path("todos.lock")),
+            compaction_lock=FileLock(get_data_path("todos.compact.lock"))
+        )
+        
+        # Every completed session and task is appended to the session log
+        self.session_log = SessionLog(get_data_path("sessions.log"))
+        
+        # Daily stats older than the recent window, one file per year
+        self.history_archive = YearlyHistoryArchive(get_data_path("history"))
+        
+        # productivity_data.json is serialized and written on one background thread
+        self.persistence = PersistenceWorker()
+        
+        # Timer checkpoints are written off the UI thread as soon as they change
+        self.timer_state_file = WriteBehindFile(get_data_path("timer_state.json"), delay=0)
+        
+        # settings.json is written off the UI thread, coalescing bursts of changes
+        self.settings_file = WriteBehindFile(get_data_path("settings.json"))
+        
+        # SQLite database, opened when settings select that backend
+        self.db = None
         
         # Categories and priorities
         self.categories = ["General", "Work", "Study", "Personal", "Health", "Finance"]
@@ -399,11 +955,22 @@ class PomodoroStrike(ctk.CTk):
         self.last_water_reminder = datetime.now()
         self.last_activity = datetime.now()
         
-        # Load data
-        self.load_settings()
-        self.load_todos()
-        self.load_total_focus_time()
-        self.load_productivity_data()
+        # Load data, from the binary snapshot when it is up to date with the JSON files
+        snapshot_loaded = self.load_state_snapshot()
+        if not snapshot_loaded:
+            self.load_settings()
+        self.open_database()
+        if not snapshot_loaded:
+            self.load_todos()
+            self.load_total_focus_time()
+            self.load_productivity_data()
+        
+        # Session state machine
+        self.engine = PomodoroEngine(self.settings)
+        self.engine.subscribe("tick", self.on_engine_tick)
+        self.engine.subscribe("mode_changed", self.on_mode_changed)
+        self.engine.subscribe("session_complete", self.handle_session_complete)
+        self.engine.subscribe("state_changed", self.save_timer_checkpoint)
         
         # Apply theme
         self.apply_theme()
@@ -411,10 +978,13 @@ class PomodoroStrike(ctk.CTk):
         # Create UI
         self.create_widgets()
         
+        # Pick up a session that was running or paused when the app last exited
+        self.restore_timer_checkpoint()
+        
         # Update UI after creation
         self.update_display()
         self.update_session_dots()
-        self.update_sidebar_stats()
+        self.ui_updates.mark_dirty("sidebar_stats")
         
         # Bind keyboard shortcuts
         self.bind("<Key>", self.handle_keyboard_shortcuts)
@@ -429,6 +999,10 @@ class PomodoroStrike(ctk.CTk):
         # Bind resize events
         self.bind("<Configure>", self.on_resize)
         
+        # Pause the ring animation while the window is minimized
+        self.bind("<Unmap>", self.on_unmap)
+        self.bind("<Map>", self.on_map)
+        
         # Bind mouse and keyboard events for idle detection
         self.bind("<Button-1>", self.update_activity)
         self.bind("<Key>", self.update_activity)
@@ -444,6 +1018,10 @@ class PomodoroStrike(ctk.CTk):
         # Initial UI update
         self.update_total_time_display()
         
+        # Later launches hand off to this instance; one may have arrived before the main loop started
+        self.bind("<<ActivationRequested>>", self.handle_activation_request)
+        self.after_idle(self.handle_activation_request)
+        
     def setup_system_tray(self):
         """Setup system tray icon and menu"""
         try:
@@ -486,17 +1064,49 @@ class PomodoroStrike(ctk.CTk):
         self.deiconify()
         self.lift()
         self.focus_force()
+        if hasattr(self, 'progress_ring'):
+            self.progress_ring.resume_animation("hidden")
+        
+    def request_activation(self):
+        """Called from the single-instance listener thread when the app is launched again.
+
+        Tkinter hands the virtual event to the main loop, so the window is shown on
+        the main thread without polling for requests.
+        """
+        self.activation_requested.set()
+        try:
+            self.event_generate("<<ActivationRequested>>", when="tail")
+        except (RuntimeError, tk.TclError):
+            pass  # the main loop is not running yet (picked up once it starts) or has stopped
+        
+    def handle_activation_request(self, event=None):
+        if self.activation_requested.is_set():
+            self.activation_requested.clear()
+            self.show_app()
         
     def hide_app(self):
         """Hide the main window to system tray"""
         if self.system_tray:
             self.withdraw()
+            if hasattr(self, 'progress_ring'):
+                self.progress_ring.suspend_animation("hidden")
             
     def quit_app(self, icon=None, item=None):
         """Quit the application"""
-        self.stop_timer = True # ensure timer thread exits
+        self.timer.cancel() # ensure timer thread exits
         if self.system_tray:
             self.system_tray.stop()
+        if self.export_job and not self.export_job.done:
+            self.export_job.cancel()  # stops between chunks and removes the partial file
+            self.export_job.thread.join()
+        self.todo_journal.close()
+        self.settings_file.flush()
+        self.timer_state_file.flush()
+        self.persistence.flush()
+        self.session_log.close()
+        self.save_state_snapshot()
+        if self.db:
+            self.db.close()
         self.destroy() # use destroy instead of quit
         
     def on_closing(self):
@@ -780,6 +1390,7 @@ class PomodoroStrike(ctk.CTk):
         # Progress ring with larger size
         self.progress_ring = ProgressRing(timer_container, size=400)
         self.progress_ring.pack(expand=True)
+        self.apply_ring_animation()
         
         # Time display overlay
         time_frame = ctk.CTkFrame(timer_container, fg_color="transparent")
@@ -941,6 +1552,16 @@ class PomodoroStrike(ctk.CTk):
             font=ctk.CTkFont(size=16, weight="bold")
         ).pack(anchor="w", pady=(0, 10))
         
+        # Ring animation
+        ctk.CTkLabel(content_frame, text="Ring animation", font=ctk.CTkFont(size=14)).pack(anchor="w", pady=(0, 5))
+        self.ring_animation_var = ctk.StringVar(value=self.settings["ring_animation"])
+        ring_animation_menu = ctk.CTkOptionMenu(
+            content_frame,
+            values=list(RING_ANIMATION_FRAME_RATES.keys()),
+            variable=self.ring_animation_var
+        )
+        ring_animation_menu.pack(fill="x", pady=(0, 20))
+        
         # Notification Settings
         ctk.CTkLabel(
             content_frame, 
@@ -1007,6 +1628,25 @@ class PomodoroStrike(ctk.CTk):
         )
         sound_menu.pack(fill="x", pady=(0, 20))
         
+        # Storage Settings
+        ctk.CTkLabel(
+            content_frame, 
+            text="Storage Settings", 
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(anchor="w", pady=(0, 10))
+        
+        self.sqlite_storage_var = ctk.BooleanVar(value=self.settings["storage_backend"] == "sqlite")
+        sqlite_storage_checkbox = ctk.CTkCheckBox(
+            content_frame, 
+            text="Store data in a SQLite database (applies on restart)",
+            variable=self.sqlite_storage_var
+        )
+        sqlite_storage_checkbox.pack(anchor="w", pady=(0, 20))
+        if self.db:
+            # The JSON files stop being written once the database is in use, so they are out of date
+            sqlite_storage_checkbox.configure(state="disabled")
+            CTkToolTip(sqlite_storage_checkbox, message="Data in the database can't be moved back to JSON files")
+        
         # Update Settings
         if UPDATE_SYSTEM_AVAILABLE:
             ctk.CTkLabel(
@@ -1082,11 +1722,14 @@ class PomodoroStrike(ctk.CTk):
             self.settings["water_reminders"] = self.water_reminders_var.get()
             self.settings["water_interval"] = int(self.water_interval_entry.get())
             self.settings["sound"] = self.sound_var.get()
+            self.settings["ring_animation"] = self.ring_animation_var.get()
+            self.settings["storage_backend"] = "sqlite" if self.sqlite_storage_var.get() else "json"
             
             self.save_settings_to_file()
             
             # Apply theme changes
             self.apply_theme()
+            self.apply_ring_animation()
             
             self.reset_timer()
             
@@ -1103,34 +1746,29 @@ class PomodoroStrike(ctk.CTk):
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numbers for time settings.")
             
+    # Timer state is owned by the engine
+    mode = property(lambda self: self.engine.mode)
+    sessions = property(lambda self: self.engine.sessions)
+    time_left = property(lambda self: self.engine.time_left)
+    total_time = property(lambda self: self.engine.total_time)
+    is_running = property(lambda self: self.engine is not None and self.engine.is_running)
+    is_paused = property(lambda self: self.engine is not None and self.engine.is_paused)
+    
     def switch_mode(self, mode):
-        if self.is_running:
-            return
-            
-        self.mode = mode
+        self.engine.switch_mode(mode)
         
-        # Update time and color based on mode
+    def on_mode_changed(self, mode):
+        """Update labels, buttons and colors for the engine's new mode"""
         if mode == "pomodoro":
-            self.time_left = self.settings["pomodoro_time"] * 60
-            self.total_time = self.settings["pomodoro_time"] * 60
             self.mode_label.configure(text="Focus Time")
-            if hasattr(self, 'progress_ring'):
-                self.progress_ring.set_color("#3498db")  # Blue for focus
         elif mode == "short_break":
-            self.time_left = self.settings["short_break_time"] * 60
-            self.total_time = self.settings["short_break_time"] * 60
             self.mode_label.configure(text="Short Break")
-            if hasattr(self, 'progress_ring'):
-                self.progress_ring.set_color("#2ecc71")  # Green for short break
         elif mode == "long_break":
-            self.time_left = self.settings["long_break_time"] * 60
-            self.total_time = self.settings["long_break_time"] * 60
             self.mode_label.configure(text="Long Break")
-            if hasattr(self, 'progress_ring'):
-                self.progress_ring.set_color("#9b59b6")  # Purple for long break
             
         # Update button states
         self.update_mode_buttons()
+        self.ui_updates.mark_dirty("color")
         self.update_display()
         
     def update_mode_buttons(self):
@@ -1148,66 +1786,70 @@ class PomodoroStrike(ctk.CTk):
             self.long_break_btn.configure(fg_color=("gray65", "gray35"))
             
     def start_timer(self):
-        if not self.is_running:
-            self.is_running = True
-            self.is_paused = False
-            self.stop_timer = False
-            
+        if self.engine.start():
             self.start_btn.configure(state="disabled")
             self.pause_btn.configure(state="normal")
             
-            self.timer_thread = threading.Thread(target=self.timer_loop)
-            self.timer_thread.daemon = True
-            self.timer_thread.start()
+            # The countdown thread shares the engine's deadline and only wakes us up
+            self.timer.start(self.engine.time_left, deadline=self.engine.deadline)
+            self.ui_updates.schedule()
             
     def pause_timer(self):
-        if self.is_running:
-            self.is_paused = not self.is_paused
-            
+        if self.engine.toggle_pause():
             if self.is_paused:
+                self.timer.pause()
                 self.pause_btn.configure(text="▶️ Resume")
             else:
+                self.timer.resume(deadline=self.engine.deadline)
                 self.pause_btn.configure(text="⏸️ Pause")
+                self.ui_updates.schedule()
                 
     def reset_timer(self):
-        self.stop_timer = True
-        if self.timer_thread:
-            self.timer_thread.join(timeout=0.2)
-        self.is_running = False
-        self.is_paused = False
-        
-        # Reset time to total time
-        if self.mode == "pomodoro":
-            self.time_left = self.settings["pomodoro_time"] * 60
-        elif self.mode == "short_break":
-            self.time_left = self.settings["short_break_time"] * 60
-        elif self.mode == "long_break":
-            self.time_left = self.settings["long_break_time"] * 60
-
-        self.total_time = self.time_left
+        # Never waits for the worker; its late callbacks are dropped by generation
+        self.timer.cancel()
+        self.engine.reset()
         
         # Reset buttons
         self.start_btn.configure(state="normal")
         self.pause_btn.configure(state="disabled", text="⏸️ Pause")
         
+    def on_timer_tick(self, generation, seconds_left):
+        """Called from the countdown thread each time the displayed second changes"""
+        # Picked up by the main thread on its next frame
+        self.pending_timer_tick = (generation, seconds_left)
+        self.ui_updates.mark_dirty("timer_tick")
+        
+    def apply_timer_tick(self):
+        generation, seconds_left = self.pending_timer_tick
+        if self.timer.is_current(generation):
+            self.engine.poll()
+            
+    def on_engine_tick(self, time_left):
         self.update_display()
         
-    def timer_loop(self):
-        while self.time_left > 0 and not self.stop_timer:
-            if not self.is_paused:
-                time.sleep(1)
-                self.time_left -= 1
-                
-                # Update display in main thread
-                self.after(0, self.update_display)
-                
-        if not self.stop_timer:
-            self.after(0, self.handle_timer_complete)
+    def on_timer_complete(self, generation):
+        """Called from the countdown thread when the deadline is reached"""
+        self.pending_timer_complete = generation
+        self.ui_updates.mark_dirty("timer_complete")
+        
+    def apply_timer_complete(self):
+        if not self.timer.is_current(self.pending_timer_complete):
+            return
             
-    def handle_timer_complete(self):
-        self.is_running = False
-        self.stop_timer = True
+        report = self.timer.drift_report()
+        self.timer.cancel()
+
+        # The deadline has passed, so the engine completes the session
+        self.engine.poll()
         
+        # Record how accurately the session was timed, up to the moment it completed; a session
+        # whose deadline passed while the app was closed never ticked and is left out
+        if report and report["ticks"] and self.engine.completion_drift is not None:
+            report["completion_drift"] = self.engine.completion_drift
+            self.timer_drifts.append(report)
+            
+    def handle_session_complete(self, mode, sessions):
+        """React to the engine finishing a session; it switches mode afterwards"""
         # Reset buttons
         self.start_btn.configure(state="normal")
         self.pause_btn.configure(state="disabled", text="⏸️ Pause")
@@ -1221,16 +1863,19 @@ class PomodoroStrike(ctk.CTk):
         # Check water reminder
         self.check_water_reminder()
         
-        # Update session count for pomodoro sessions
-        if self.mode == "pomodoro":
-            self.sessions += 1
+        # Log the session
+        record = self.completed_session_record(mode)
+        self.save_session(record)
+        
+        # Update focus totals for pomodoro sessions
+        if mode == "pomodoro":
             self.total_focus_time += self.settings["pomodoro_time"]
             self.save_total_focus_time()
             self.update_session_dots()
             self.update_total_time_display()
             
             # Update productivity data
-            self.productivity_data.update_daily_stats(self.settings["pomodoro_time"])
+            self.productivity_data.record_session(record)
             self.productivity_data.update_focus_streak(True)
             
             # Check for achievements
@@ -1242,33 +1887,70 @@ class PomodoroStrike(ctk.CTk):
             # Save productivity data
             self.save_productivity_data()
             
-        # Auto-start next session if enabled
-        if self.settings["auto_start"]:
-            if self.mode == "pomodoro":
-                # Check custom break interval
-                if self.sessions % self.settings["custom_break_interval"] == 0:
-                    if self.sessions % self.settings["long_break_frequency"] == 0:
-                        self.switch_mode("long_break")
-                    else:
-                        self.switch_mode("short_break")
-                else:
-                    self.switch_mode("short_break")
-            else:
-                self.switch_mode("pomodoro")
-                
         self.update_display()
-        self.update_sidebar_stats()
+        self.ui_updates.mark_dirty("sidebar_stats")
+
+    def save_timer_checkpoint(self):
+        """Record the timer state; called by the engine on every state transition"""
+        self.timer_state_file.save(self.engine.checkpoint())
+        
+    def restore_timer_checkpoint(self):
+        """Resume the session saved by save_timer_checkpoint, if any"""
+        try:
+            with open(get_data_path("timer_state.json"), "r") as f:
+                self.engine.restore(json.load(f))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Failed to restore timer state: {e}")
+            return
+            
+        self.on_mode_changed(self.mode)
+        if not self.is_running:
+            return
+        self.start_btn.configure(state="disabled")
+        self.pause_btn.configure(state="normal")
+        
+        # A deadline that passed while the app was closed completes the session on the first frame
+        if self.is_paused:
+            self.timer.start(self.engine.paused_remaining)
+            self.timer.pause()
+            self.pause_btn.configure(text="▶️ Resume")
+        else:
+            self.timer.start(self.engine.remaining(), deadline=self.engine.deadline)
+            self.ui_updates.schedule()
+            
+    def completed_session_record(self, mode):
+        """Session log record for the session the engine just completed"""
+        # The engine's end time, which is earlier than now if the deadline passed while the app was closed
+        end = time.time() - (self.engine.clock() - self.engine.ended_at)
+        return session_record(
+            start=end - self.engine.elapsed(),
+            end=end,
+            kind=mode,
+            planned=self.engine.total_time,
+            pause_count=self.engine.pause_count,
+            paused=round(self.engine.paused_time)
+        )
 
     def update_display(self):
+        """Schedule the time text and progress ring to be refreshed on the next frame"""
+        self.ui_updates.mark_dirty("time_text", "progress")
+        
+    def update_time_text(self):
         minutes = self.time_left // 60
         seconds = self.time_left % 60
         time_str = f"{minutes:02d}:{seconds:02d}"
         self.time_display.configure(text=time_str)
         
-        # Update progress ring
+    def update_progress_ring(self):
         if hasattr(self, 'progress_ring') and self.total_time > 0:
             progress = 1.0 - (self.time_left / self.total_time)
             self.progress_ring.set_progress(progress)
+            
+    def update_ring_color(self):
+        if hasattr(self, 'progress_ring'):
+            self.progress_ring.set_color(MODE_RING_COLORS.get(self.mode, MODE_RING_COLORS["pomodoro"]))
         
     def play_sound(self):
         if self.settings["sound"] == "none":
@@ -1467,7 +2149,7 @@ class PomodoroStrike(ctk.CTk):
         ).pack(side="right", fill="x", expand=True, padx=(5, 0))
         
         # Todo list
-        self.todo_list_frame = ctk.CTkScrollableFrame(self.todo_sidebar)
+        self.todo_list_frame = VirtualTodoList(self.todo_sidebar, self, self.todos)
         self.todo_list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
         # Todo stats
@@ -1539,10 +2221,10 @@ class PomodoroStrike(ctk.CTk):
             )
             todo.estimated_time = estimated_time
             
-            self.todos.append(todo)
-            self.save_todos()
-            self.render_todos()
-            self.update_sidebar_stats()
+            self.todos.add(todo)
+            self.save_todo(todo)
+            self.todo_list_frame.insert_item(todo)
+            self.update_todo_count()
             
             # Clear input fields
             self.todo_input.delete(0, "end")
@@ -1592,136 +2274,10 @@ class PomodoroStrike(ctk.CTk):
             )
             
     def render_todos(self):
-        # Clear existing todos
-        for widget in self.todo_list_frame.winfo_children():
-            widget.destroy()
-            
-        # Filter todos (simplified without filter UI for now)
-        filtered_todos = []
-        for todo in self.todos:
-            # Show all todos for now
-            filtered_todos.append(todo)
-            
-        # Sort todos: incomplete first, then by priority, then by due date
-        def sort_key(todo):
-            if todo.completed:
-                return (1, 0, None)  # Completed tasks go last
-            else:
-                priority_order = {"Urgent": 0, "High": 1, "Medium": 2, "Low": 3}
-                due_date = None
-                if todo.due_date:
-                    try:
-                        due_date = datetime.strptime(todo.due_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        pass
-                return (0, priority_order.get(todo.priority, 2), due_date)
-                
-        filtered_todos.sort(key=sort_key)
-        
-        # Render todos
-        for todo in filtered_todos:
-            self.create_todo_widget(todo)
-            
-        # Update counts
-        completed_count = sum(1 for todo in self.todos if todo.completed)
-        remaining_count = len(self.todos) - completed_count
-        
-        if hasattr(self, 'completed_count_label'):
-            self.completed_count_label.configure(text=str(completed_count))
-        if hasattr(self, 'remaining_count_label'):
-            self.remaining_count_label.configure(text=str(remaining_count))
-        
-    def create_todo_widget(self, todo):
-        todo_frame = ctk.CTkFrame(self.todo_list_frame)
-        todo_frame.pack(fill="x", pady=2)
-        
-        # Main content frame
-        content_frame = ctk.CTkFrame(todo_frame)
-        content_frame.pack(fill="x", padx=5, pady=5)
-        
-        # Top row: checkbox, text, delete button
-        top_row = ctk.CTkFrame(content_frame)
-        top_row.pack(fill="x", pady=2)
-        
-        # Checkbox
-        completed_var = ctk.BooleanVar(value=todo.completed)
-        checkbox = ctk.CTkCheckBox(
-            top_row,
-            text="",
-            variable=completed_var,
-            command=lambda: self.toggle_todo(todo.id, completed_var)
-        )
-        checkbox.pack(side="left", padx=(5, 5), pady=5)
-        
-        # Todo text
-        text_color = "gray" if todo.completed else "white"
-        text_label = ctk.CTkLabel(
-            top_row,
-            text=todo.text,
-            text_color=text_color,
-            anchor="w",
-            wraplength=200
-        )
-        text_label.pack(side="left", fill="x", expand=True, padx=(0, 5), pady=5)
-        
-        # Delete button
-        delete_btn = ctk.CTkButton(
-            top_row,
-            text="✕",
-            width=25,
-            height=25,
-            command=lambda: self.delete_todo(todo.id)
-        )
-        delete_btn.pack(side="right", padx=(0, 5), pady=5)
-        
-        # Bottom row: metadata
-        if not todo.completed:
-            meta_row = ctk.CTkFrame(content_frame)
-            meta_row.pack(fill="x", pady=2)
-            
-            # Category badge
-            category_color = self.get_category_color(todo.category)
-            category_label = ctk.CTkLabel(
-                meta_row,
-                text=todo.category,
-                font=ctk.CTkFont(size=10),
-                fg_color=category_color,
-                corner_radius=10,
-                width=60
-            )
-            category_label.pack(side="left", padx=(5, 2), pady=2)
-            
-            # Priority badge
-            priority_color = self.get_priority_color(todo.priority)
-            priority_label = ctk.CTkLabel(
-                meta_row,
-                text=todo.priority,
-                font=ctk.CTkFont(size=10),
-                fg_color=priority_color,
-                corner_radius=10,
-                width=50
-            )
-            priority_label.pack(side="left", padx=2, pady=2)
-            
-            # Due date
-            if todo.due_date:
-                due_date_label = ctk.CTkLabel(
-                    meta_row,
-                    text=f"Due: {todo.due_date}",
-                    font=ctk.CTkFont(size=10),
-                    text_color=self.get_due_date_color(todo.due_date)
-                )
-                due_date_label.pack(side="left", padx=(10, 2), pady=2)
-                
-            # Estimated time
-            if todo.estimated_time > 0:
-                time_label = ctk.CTkLabel(
-                    meta_row,
-                    text=f"Est: {todo.estimated_time}m",
-                    font=ctk.CTkFont(size=10),
-                    text_color="gray"
-                )
-                time_label.pack(side="right", padx=(2, 5), pady=2)
+        # Render todos in the store's display order; only the rows in view get widgets
+        # (filtering is not implemented yet, so all todos are shown)
+        self.todo_list_frame.refresh()
+        self.update_todo_count()
                 
     def get_category_color(self, category):
         """Get color for category badge"""
@@ -1773,7 +2329,7 @@ class PomodoroStrike(ctk.CTk):
         
         # Calculate statistics
         total_tasks = len(self.todos)
-        completed_tasks = sum(1 for todo in self.todos if todo.completed)
+        completed_tasks = self.todos.completed_count
         pending_tasks = total_tasks - completed_tasks
         
         # Category breakdown
@@ -1869,29 +2425,40 @@ class PomodoroStrike(ctk.CTk):
             ).pack(side="right", padx=10, pady=5)
         
     def toggle_todo(self, todo_id, completed_var):
-        todo = next((t for t in self.todos if t.id == todo_id), None)
+        todo = self.todos.get(todo_id)
         if todo:
             todo.completed = completed_var.get()
-            self.save_todos()
-            self.render_todos()
+            old_index, _ = self.todos.update(todo)
+            self.save_todo(todo)
+            self.todo_list_frame.update_item(todo, old_index)
             self.update_todo_count()
             
             # Update productivity data for completed tasks
             if todo.completed:
-                self.productivity_data.update_daily_stats(0, 1)  # 0 focus time, 1 task completed
+                now = time.time()
+                record = session_record(now, now, "task", task_id=todo.id)
+                self.save_session(record)
+                self.productivity_data.record_session(record)
                 self.save_productivity_data()
             
     def delete_todo(self, todo_id):
-        self.todos = [t for t in self.todos if t.id != todo_id]
-        self.save_todos()
-        self.render_todos()
+        index = self.todos.remove(todo_id)
+        if index is None:
+            return
+        self.save_todo_deletion(todo_id)
+        self.todo_list_frame.remove_item(index)
         self.update_todo_count()
         
     def update_todo_count(self):
         """Update todo count display"""
-        count = len([t for t in self.todos if not t.completed])
+        count = len(self.todos) - self.todos.completed_count
+        if hasattr(self, 'completed_count_label'):
+            self.completed_count_label.configure(text=str(self.todos.completed_count))
+        if hasattr(self, 'remaining_count_label'):
+            self.remaining_count_label.configure(text=str(count))
+            
         # Update sidebar stats instead of a separate count variable
-        self.update_sidebar_stats()
+        self.ui_updates.mark_dirty("sidebar_stats")
         
     def handle_keyboard_shortcuts(self, event):
         # Space to toggle timer
@@ -1920,11 +2487,7 @@ class PomodoroStrike(ctk.CTk):
             self.toggle_fullscreen()
             
     def save_settings_to_file(self):
-        try:
-            with open(get_data_path("settings.json"), "w") as f:
-                json.dump(self.settings, f)
-        except:
-            pass
+        self.settings_file.save(dict(self.settings))
             
     def load_settings(self):
         try:
@@ -1934,49 +2497,83 @@ class PomodoroStrike(ctk.CTk):
         except:
             pass
             
-    def save_todos(self):
+    def open_database(self):
+        """Open the SQLite backend if selected, importing the JSON files on first use.
+
+        JSON files written since the last import (the JSON backend was used
+        in between, e.g. because the database failed to open) are imported
+        again, as they hold the newest data.
+        """
+        if self.settings["storage_backend"] != "sqlite":
+            return
         try:
-            todos_data = []
-            for todo in self.todos:
-                todos_data.append({
-                    "id": todo.id,
-                    "text": todo.text,
-                    "completed": todo.completed,
-                    "created_at": todo.created_at,
-                    "category": todo.category,
-                    "priority": todo.priority,
-                    "due_date": todo.due_date,
-                    "estimated_time": todo.estimated_time,
-                    "actual_time": todo.actual_time
-                })
-            with open(get_data_path("todos.json"), "w") as f:
-                json.dump(todos_data, f)
-        except:
-            pass
+            self.db = SQLiteStore(get_data_path("pomodoro_strike.db"))
+            migrated_at = self.db.migrated_at
+            if migrated_at is None or self.json_data_modified() > migrated_at:
+                self.migrate_json_to_sqlite()
+        except Exception as e:
+            print(f"Failed to open database, using JSON files: {e}")
+            self.db = None
+            
+    def json_data_modified(self):
+        """Newest modification time of the JSON data files the database is imported from"""
+        paths = [path for path in self.snapshot_sources() if os.path.basename(path) != "settings.json"]
+        paths += [self.history_archive.path(year) for year in self.history_archive.years()]
+        newest = 0.0
+        for path in paths:
+            try:
+                newest = max(newest, os.path.getmtime(path))
+            except OSError:
+                pass
+        return newest
+            
+    def migrate_json_to_sqlite(self):
+        """Copy todos, focus time and productivity history into the database"""
+        todos = self.todo_journal.load()
+        total_focus_time = 0
+        productivity = {}
+        if os.path.exists(get_data_path("total_focus_time.json")):
+            with open(get_data_path("total_focus_time.json"), "r") as f:
+                total_focus_time = json.load(f).get("total_focus_time", 0)
+        if os.path.exists(get_data_path("productivity_data.json")):
+            with open(get_data_path("productivity_data.json"), "r") as f:
+                productivity = json.load(f)
+        productivity["daily_stats"] = {**self.history_archive.read(), **productivity.get("daily_stats", {})}
+        self.db.migrate_from_json(todos, total_focus_time, productivity)
+        
+    def save_todo(self, todo):
+        """Journal one added or changed todo"""
+        try:
+            if self.db:
+                self.db.put_todo(todo.to_dict())
+                return
+            self.todo_journal.put(todo.to_dict())
+        except Exception as e:
+            print(f"Failed to save todo: {e}")
+            
+    def save_todo_deletion(self, todo_id):
+        """Journal one deleted todo"""
+        try:
+            if self.db:
+                self.db.delete_todo(todo_id)
+                return
+            self.todo_journal.delete(todo_id)
+        except Exception as e:
+            print(f"Failed to save todo deletion: {e}")
             
     def load_todos(self):
         try:
-            with open(get_data_path("todos.json"), "r") as f:
-                todos_data = json.load(f)
-                self.todos = []
-                for todo_data in todos_data:
-                    todo = TodoItem(
-                        todo_data["text"],
-                        todo_data["completed"],
-                        todo_data["created_at"],
-                        todo_data["category"],
-                        todo_data["priority"],
-                        todo_data["due_date"]
-                    )
-                    todo.id = todo_data["id"]
-                    todo.estimated_time = todo_data["estimated_time"]
-                    todo.actual_time = todo_data["actual_time"]
-                    self.todos.append(todo)
-        except:
-            pass
+            todos_data = self.db.load_todos() if self.db else self.todo_journal.load()
+            todos = [TodoItem.from_dict(todo_data) for todo_data in todos_data]
+            self.todos.load(todos)
+        except Exception as e:
+            print(f"Failed to load todos: {e}")
             
     def save_total_focus_time(self):
         try:
+            if self.db:
+                self.db.set_meta("total_focus_time", self.total_focus_time)
+                return
             with open(get_data_path("total_focus_time.json"), "w") as f:
                 json.dump({"total_focus_time": self.total_focus_time}, f)
         except:
@@ -1984,12 +2581,22 @@ class PomodoroStrike(ctk.CTk):
             
     def load_total_focus_time(self):
         try:
-            with open(get_data_path("total_focus_time.json"), "r") as f:
-                data = json.load(f)
-                self.total_focus_time = data.get("total_focus_time", 0)
-                self.update_total_time_display()
+            if self.db:
+                self.total_focus_time = self.db.get_meta("total_focus_time", 0)
+            else:
+                with open(get_data_path("total_focus_time.json"), "r") as f:
+                    data = json.load(f)
+                    self.total_focus_time = data.get("total_focus_time", 0)
+            self.update_total_time_display()
         except:
             pass
+            
+    def save_session(self, record):
+        """Append a completed session or task to the session log"""
+        try:
+            self.session_log.append(record)
+        except Exception as e:
+            print(f"Failed to save session: {e}")
 
     def apply_theme(self):
         """Apply current theme and appearance mode"""
@@ -2008,7 +2615,13 @@ class PomodoroStrike(ctk.CTk):
             
         # Update progress ring if it exists
         if hasattr(self, 'progress_ring'):
-            self.progress_ring.draw_ring()
+            self.progress_ring.apply_theme()
+
+    def apply_ring_animation(self):
+        """Apply the configured progress ring frame rate"""
+        if hasattr(self, 'progress_ring'):
+            frame_rate = RING_ANIMATION_FRAME_RATES.get(self.settings["ring_animation"], 20)
+            self.progress_ring.set_frame_rate(frame_rate)
 
     def show_motivational_quote(self):
         """Show a random motivational quote"""
@@ -2065,53 +2678,167 @@ class PomodoroStrike(ctk.CTk):
         self.after(30000, check_idle)
         
     def load_productivity_data(self):
-        """Load productivity data from file"""
+        """Load productivity data from file; daily stats before the recent window are paged in later"""
+        productivity_data = self.productivity_data
         try:
-            with open(get_data_path("productivity_data.json"), "r") as f:
-                data = json.load(f)
-                self.productivity_data.focus_streak = data.get("focus_streak", 0)
-                self.productivity_data.longest_streak = data.get("longest_streak", 0)
-                self.productivity_data.daily_goals = data.get("daily_goals", self.productivity_data.daily_goals)
-                self.productivity_data.achievements = data.get("achievements", [])
-                self.productivity_data.daily_stats = defaultdict(lambda: {
-                    "focus_sessions": 0,
-                    "focus_time": 0,
-                    "tasks_completed": 0,
-                    "productivity_score": 0.0
-                }, data.get("daily_stats", {}))
-                self.productivity_data.weekly_stats = defaultdict(lambda: {
-                    "focus_sessions": 0,
-                    "focus_time": 0,
-                    "tasks_completed": 0,
-                    "productivity_score": 0.0
-                }, data.get("weekly_stats", {}))
-                self.productivity_data.monthly_stats = defaultdict(lambda: {
-                    "focus_sessions": 0,
-                    "focus_time": 0,
-                    "tasks_completed": 0,
-                    "productivity_score": 0.0
-                }, data.get("monthly_stats", {}))
-                self.productivity_data.best_hours = defaultdict(int, data.get("best_hours", {}))
+            if self.db:
+                data = self.db.load_productivity(since=productivity_data.recent_window_start())
+            else:
+                with open(get_data_path("productivity_data.json"), "r") as f:
+                    data = json.load(f)
+            self.apply_productivity_data(data)
+            if self.db:
+                productivity_data.history_loader = self.db.daily_dict
+                productivity_data.history_before = productivity_data.recent_window_start()
+                productivity_data.window_start = None
         except:
-            pass
+            # No usable stats file: recover what the session log has
+            if self.session_log.exists():
+                productivity_data.rollups.rebuild(self.session_log)
+                productivity_data.window_start = next(iter(productivity_data.daily_stats), None)
+                
+            # Days archived before the log began stay reachable through the yearly files
+            if not self.db:
+                productivity_data.history_loader = self.history_archive.read
+                productivity_data.history_before = productivity_data.window_start or productivity_data.recent_window_start()
+                
+    def apply_productivity_data(self, data):
+        """Replace the productivity data with a dict shaped like productivity_data.json"""
+        productivity_data = self.productivity_data
+        productivity_data.focus_streak = data.get("focus_streak", 0)
+        productivity_data.longest_streak = data.get("longest_streak", 0)
+        productivity_data.daily_goals = data.get("daily_goals", productivity_data.daily_goals)
+        productivity_data.achievements = data.get("achievements", [])
+        daily = data.get("daily_stats")
+        productivity_data.daily_stats = daily if isinstance(daily, DailyStats) else DailyStats(daily)
+        productivity_data.weekly_stats = defaultdict(lambda: {
+            "focus_sessions": 0,
+            "focus_time": 0,
+            "tasks_completed": 0,
+            "productivity_score": 0.0
+        }, data.get("weekly_stats", {}))
+        productivity_data.monthly_stats = defaultdict(lambda: {
+            "focus_sessions": 0,
+            "focus_time": 0,
+            "tasks_completed": 0,
+            "productivity_score": 0.0
+        }, data.get("monthly_stats", {}))
+        productivity_data.best_hours = defaultdict(
+            int, {int(hour): count for hour, count in data.get("best_hours", {}).items()}
+        )
+        if data.get("focus_matrix"):
+            productivity_data.focus_matrix = [list(row) for row in data["focus_matrix"]]
+        else:
+            # Saved before the heatmap existed: derive it from the session log in one pass
+            productivity_data.rollups.rebuild(self.session_log, ("heatmap",))
+        
+        # Files written before the yearly history existed hold every day
+        productivity_data.window_start = data.get("history_before") or next(iter(productivity_data.daily_stats), None)
+        if data.get("history_before"):
+            productivity_data.history_loader = self.history_archive.read
+            productivity_data.history_before = data["history_before"]
+            
+    def snapshot_sources(self):
+        """JSON files the binary state snapshot is derived from"""
+        return [get_data_path(name) for name in (
+            "settings.json", "todos.json", "todos.journal", "todos.journal.1",
+            "total_focus_time.json", "productivity_data.json"
+        )]
+        
+    def load_state_snapshot(self):
+        """Restore settings, todos and productivity data from state.snapshot if it matches the JSON files"""
+        state = read_snapshot(get_data_path("state.snapshot"), self.snapshot_sources())
+        if state is None:
+            return False
+        if state["settings"].get("storage_backend", "json") != "json":
+            return False  # the database is the source of truth, not the JSON files
+        try:
+            self.settings.update(state["settings"])
+            self.todos.load([TodoItem.from_dict(todo_data) for todo_data in state["todos"]])
+            self.todo_journal.records = state["todo_journal_records"]
+            self.total_focus_time = state["total_focus_time"]
+            productivity = dict(state["productivity"])
+            productivity["daily_stats"] = DailyStats.from_columns(productivity["daily_stats"])
+            self.apply_productivity_data(productivity)
+        except Exception as e:
+            print(f"Failed to restore state snapshot: {e}")
+            return False
+        self.update_total_time_display()
+        return True
+        
+    def save_state_snapshot(self):
+        """Write state.snapshot so the next start can skip parsing JSON (JSON backend only)"""
+        if self.db or self.settings["storage_backend"] != "json":
+            return
+        try:
+            productivity = self.productivity_data.snapshot()
+            productivity["daily_stats"] = productivity["daily_stats"].dump_columns()
+            state = {
+                "settings": dict(self.settings),
+                "todos": [todo.to_dict() for todo in self.todos],
+                "todo_journal_records": self.todo_journal.records,
+                "total_focus_time": self.total_focus_time,
+                "productivity": productivity
+            }
+            write_snapshot(get_data_path("state.snapshot"), state, self.snapshot_sources())
+        except Exception as e:
+            print(f"Failed to save state snapshot: {e}")
             
     def save_productivity_data(self):
-        """Save productivity data to file"""
+        """Save productivity data; the JSON file is written by the persistence thread"""
         try:
-            data = {
-                "focus_streak": self.productivity_data.focus_streak,
-                "longest_streak": self.productivity_data.longest_streak,
-                "daily_goals": self.productivity_data.daily_goals,
-                "achievements": self.productivity_data.achievements,
-                "daily_stats": dict(self.productivity_data.daily_stats),
-                "weekly_stats": dict(self.productivity_data.weekly_stats),
-                "monthly_stats": dict(self.productivity_data.monthly_stats),
-                "best_hours": dict(self.productivity_data.best_hours)
-            }
-            with open(get_data_path("productivity_data.json"), "w") as f:
-                json.dump(data, f, indent=2)
-        except:
-            pass
+            if self.db:
+                self.save_productivity_rows()
+                return
+            self.archive_productivity_history()
+            self.persistence.submit(
+                get_data_path("productivity_data.json"),
+                self.productivity_data.snapshot(),
+                indent=2,
+                default=json_default
+            )
+        except Exception as e:
+            print(f"Failed to save productivity data: {e}")
+            
+    def archive_productivity_history(self):
+        """Move days that have left the recent window into the yearly history files.
+
+        This runs at most once a day. Only the days in memory are copied out
+        here; the persistence thread merges them into each affected year's
+        file, ahead of the productivity file that stops holding them.
+        """
+        data = self.productivity_data
+        cutoff = data.recent_window_start()
+        if data.window_start is not None and data.window_start < cutoff:
+            first_year, last_year = int(data.window_start[:4]), int(cutoff[:4])
+            for year in range(first_year, last_year + 1):
+                days = data.daily_stats.slice(f"{year}-01-01", min(cutoff, f"{year + 1}-01-01"))
+                if days:
+                    self.persistence.submit_call(self.history_archive.write_year, year, days.to_dict())
+        if data.window_start is None or data.window_start < cutoff:
+            data.window_start = cutoff
+            
+    def save_productivity_rows(self):
+        """Upsert only the rows a session or task can change: today, this week and this month"""
+        now = datetime.now()
+        data = self.productivity_data
+        today = now.strftime("%Y-%m-%d")
+        week_key = now.strftime("%Y-W%U")
+        month_key = now.strftime("%Y-%m")
+        if today in data.daily_stats:
+            self.db.put_daily_stats(today, data.daily_stats[today])
+        if week_key in data.weekly_stats:
+            self.db.put_period_stats(week_key, "weekly", data.weekly_stats[week_key])
+        if month_key in data.monthly_stats:
+            self.db.put_period_stats(month_key, "monthly", data.monthly_stats[month_key])
+        self.db.save_productivity_meta({
+            "focus_streak": data.focus_streak,
+            "longest_streak": data.longest_streak,
+            "daily_goals": data.daily_goals,
+            "achievements": data.achievements,
+            "best_hours": dict(data.best_hours),
+            "focus_matrix": data.focus_matrix
+        })
             
     def show_productivity_dashboard(self):
         """Show comprehensive productivity dashboard"""
@@ -2141,6 +2868,10 @@ class PomodoroStrike(ctk.CTk):
         goals_tab = notebook.add("Goals")
         self.create_goals_tab(goals_tab)
         
+        # Export tab
+        export_tab = notebook.add("Export")
+        self.create_export_tab(export_tab)
+        
     def create_overview_tab(self, parent):
         """Create overview tab content"""
         # Current streak
@@ -2224,6 +2955,10 @@ class PomodoroStrike(ctk.CTk):
             
     def create_statistics_tab(self, parent):
         """Create statistics tab content"""
+        # Trends need the whole history, which is paged in on first use
+        self.productivity_data.load_history()
+        analytics = FocusAnalytics(self.productivity_data.daily_stats, self.productivity_data.best_hours)
+        
         # Weekly stats
         week_key = datetime.now().strftime("%Y-W%U")
         week_stats = self.productivity_data.weekly_stats[week_key]
@@ -2250,6 +2985,107 @@ class PomodoroStrike(ctk.CTk):
             font=ctk.CTkFont(size=14)
         ).pack(pady=10)
         
+        # Trends
+        trends_frame = ctk.CTkFrame(parent)
+        trends_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            trends_frame,
+            text="📊 Trends",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+        
+        week_over_week = analytics.week_over_week("focus_time")
+        if week_over_week["percent"] is not None:
+            change_text = f"{week_over_week['delta']:+.0f} minutes ({week_over_week['percent']:+.0f}%)"
+        else:
+            change_text = f"{week_over_week['delta']:+.0f} minutes"
+        percentiles = analytics.percentiles("focus_time", (50, 90))
+        current_streak, longest_streak = analytics.streaks()
+        weekday_totals = analytics.weekday_distribution("focus_time")
+        best_weekday = WEEKDAYS[weekday_totals.index(max(weekday_totals))] if any(weekday_totals) else "-"
+        
+        trends_text = f"""
+        7-Day Average: {analytics.latest_average('focus_time', 7):.0f} minutes/day
+        30-Day Average: {analytics.latest_average('focus_time', 30):.0f} minutes/day
+        Last 7 Days vs Previous 7: {change_text}
+        Typical Focus Day: {percentiles[50]:.0f} minutes (top 10%: {percentiles[90]:.0f}+)
+        Day Streak: {current_streak} days (longest {longest_streak})
+        Best Weekday: {best_weekday}
+        """
+        
+        ctk.CTkLabel(
+            trends_frame,
+            text=trends_text,
+            font=ctk.CTkFont(size=14)
+        ).pack(pady=10)
+        
+        # Timer accuracy of the sessions completed since the app started
+        if self.timer_drifts:
+            drifts = [report["completion_drift"] * 1000 for report in self.timer_drifts]
+            tick_latency = max(report["max_tick_latency"] for report in self.timer_drifts) * 1000
+            accuracy_text = (
+                f"Timer Accuracy: last session ended {drifts[-1]:.0f} ms late, "
+                f"worst {max(drifts):.0f} ms over {len(drifts)} sessions (slowest tick {tick_latency:.0f} ms)"
+            )
+            ctk.CTkLabel(
+                trends_frame,
+                text=accuracy_text,
+                font=ctk.CTkFont(size=12),
+                text_color="gray60"
+            ).pack(pady=(0, 10))
+        
+        # Custom range
+        range_frame = ctk.CTkFrame(parent)
+        range_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            range_frame,
+            text="📅 Custom Range",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+        
+        today = datetime.now()
+        start_day, end_day = self.stats_range or (
+            (today - timedelta(days=13)).strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+        )
+        
+        entries_frame = ctk.CTkFrame(range_frame, fg_color="transparent")
+        entries_frame.pack(pady=5)
+        
+        ctk.CTkLabel(entries_frame, text="From:").pack(side="left", padx=5)
+        start_entry = ctk.CTkEntry(entries_frame, width=110, placeholder_text="YYYY-MM-DD")
+        start_entry.pack(side="left", padx=5)
+        start_entry.insert(0, start_day)
+        
+        ctk.CTkLabel(entries_frame, text="To:").pack(side="left", padx=5)
+        end_entry = ctk.CTkEntry(entries_frame, width=110, placeholder_text="YYYY-MM-DD")
+        end_entry.pack(side="left", padx=5)
+        end_entry.insert(0, end_day)
+        
+        range_label = ctk.CTkLabel(range_frame, text="", font=ctk.CTkFont(size=14))
+        
+        def show_range():
+            start, end = start_entry.get().strip(), end_entry.get().strip()
+            if not (self.is_valid_date(start) and self.is_valid_date(end)):
+                messagebox.showerror("Error", "Please enter dates in YYYY-MM-DD format")
+                return
+            if start > end:
+                messagebox.showerror("Error", "The start date must not be after the end date")
+                return
+            self.stats_range = (start, end)
+            range_label.configure(text=self.format_range_totals(start, end))
+            
+        ctk.CTkButton(
+            entries_frame,
+            text="Calculate",
+            width=90,
+            command=show_range
+        ).pack(side="left", padx=5)
+        
+        range_label.configure(text=self.format_range_totals(start_day, end_day))
+        range_label.pack(pady=10)
+        
         # Best hours
         hours_frame = ctk.CTkFrame(parent)
         hours_frame.pack(fill="x", padx=10, pady=10)
@@ -2261,15 +3097,76 @@ class PomodoroStrike(ctk.CTk):
         ).pack(pady=10)
         
         # Get top 3 hours
-        sorted_hours = sorted(self.productivity_data.best_hours.items(), key=lambda x: x[1], reverse=True)[:3]
-        
-        for hour, count in sorted_hours:
+        for hour, count in analytics.top_hours(3):
             ctk.CTkLabel(
                 hours_frame,
                 text=f"{hour:02d}:00 - {count} sessions",
                 font=ctk.CTkFont(size=12)
             ).pack(anchor="w", padx=10, pady=2)
             
+        # Weekday x hour heatmap, drawn as one image rather than a widget per cell
+        heatmap_frame = ctk.CTkFrame(parent)
+        heatmap_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            heatmap_frame,
+            text="🗓️ Focus Heatmap",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+        
+        matrix = self.productivity_data.focus_matrix
+        ctk.CTkLabel(heatmap_frame, text="", image=self.render_focus_heatmap(matrix)).pack(padx=10, pady=5)
+        
+        minutes, weekday, hour = max((value, day, hour) for day, row in enumerate(matrix) for hour, value in enumerate(row))
+        peak_text = f"Most focused: {WEEKDAYS[weekday]}s at {hour:02d}:00 ({minutes:.0f} minutes)" if minutes else "No focus sessions yet"
+        ctk.CTkLabel(
+            heatmap_frame,
+            text=peak_text,
+            font=ctk.CTkFont(size=12)
+        ).pack(pady=(0, 10))
+        
+    def render_focus_heatmap(self, matrix, cell_size=18):
+        """Render the weekday x hour focus matrix as a CTkImage with light and dark variants"""
+        peak = max(max(row) for row in matrix) or 1
+        accent = MODE_RING_COLORS["pomodoro"]
+        accent = tuple(int(accent[i:i + 2], 16) for i in (1, 3, 5))
+        label_width, label_height = 32, 14
+        width, height = label_width + 24 * cell_size, label_height + 7 * cell_size
+        
+        def draw(background, foreground):
+            # One pixel per cell, scaled up in a single resize
+            cells = Image.new("RGB", (24, 7))
+            cells.putdata([
+                tuple(round(low + (high - low) * value / peak) for low, high in zip(background, accent))
+                for row in matrix for value in row
+            ])
+            image = Image.new("RGB", (width, height), background)
+            image.paste(cells.resize((24 * cell_size, 7 * cell_size), Image.NEAREST), (label_width, label_height))
+            
+            labels = ImageDraw.Draw(image)
+            for hour in range(0, 24, 3):
+                labels.text((label_width + hour * cell_size + 2, 1), f"{hour:02d}", fill=foreground)
+            for day, name in enumerate(WEEKDAYS):
+                labels.text((2, label_height + day * cell_size + 3), name[:3], fill=foreground)
+            return image
+            
+        return ctk.CTkImage(
+            light_image=draw((219, 219, 219), (40, 40, 40)),    # gray86 frame
+            dark_image=draw((43, 43, 43), (220, 220, 220)),     # gray17 frame
+            size=(width, height)
+        )
+            
+    def format_range_totals(self, start_day, end_day):
+        """Totals and per-day averages for a date range, from an indexed range scan or the daily prefix sums"""
+        source = self.db or self.productivity_data.daily_stats
+        totals = source.range_totals(start_day, end_day)
+        days = totals["days"]
+        return f"""
+        {days} days: {totals['focus_sessions']} sessions, {totals['focus_time']} minutes, {totals['tasks_completed']} tasks
+        Daily Average: {totals['focus_sessions'] / days:.1f} sessions, {totals['focus_time'] / days:.0f} minutes, {totals['tasks_completed'] / days:.1f} tasks
+        Average Score: {totals['productivity_score'] / days:.1f}/100
+        """
+        
     def create_achievements_tab(self, parent):
         """Create achievements tab content"""
         # Achievements list
@@ -2349,39 +3246,179 @@ class PomodoroStrike(ctk.CTk):
             command=save_goals
         ).pack(pady=10)
         
-    def export_data(self, format_type="csv"):
-        """Export productivity data"""
-        if format_type == "csv":
-            self.export_to_csv()
-        else:
-            messagebox.showinfo("Export", "PDF export coming soon!")
-            
-    def export_to_csv(self):
-        """Export data to CSV file"""
-        try:
-            filename = f"pomodoro_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    def create_export_tab(self, parent):
+        """Create export tab content"""
+        export_frame = ctk.CTkFrame(parent)
+        export_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(
+            export_frame,
+            text="💾 Export Data",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+        
+        kinds = {
+            "Daily statistics (CSV)": ("daily", "csv"),
+            "Daily statistics (JSON Lines)": ("daily", "jsonl"),
+            "Sessions (CSV)": ("sessions", "csv"),
+            "Sessions (JSON Lines)": ("sessions", "jsonl")
+        }
+        kind_var = ctk.StringVar(value=next(iter(kinds)))
+        ctk.CTkOptionMenu(export_frame, values=list(kinds), variable=kind_var).pack(fill="x", padx=10, pady=5)
+        
+        # Date range; empty means all history
+        range_frame = ctk.CTkFrame(export_frame, fg_color="transparent")
+        range_frame.pack(pady=5)
+        start_day, end_day = self.stats_range or ("", "")
+        
+        ctk.CTkLabel(range_frame, text="From:").pack(side="left", padx=5)
+        start_entry = ctk.CTkEntry(range_frame, width=110, placeholder_text="YYYY-MM-DD")
+        start_entry.pack(side="left", padx=5)
+        if start_day:
+            start_entry.insert(0, start_day)
+        
+        ctk.CTkLabel(range_frame, text="To:").pack(side="left", padx=5)
+        end_entry = ctk.CTkEntry(range_frame, width=110, placeholder_text="YYYY-MM-DD")
+        end_entry.pack(side="left", padx=5)
+        if end_day:
+            end_entry.insert(0, end_day)
+        
+        # Metrics, for daily statistics
+        metrics_frame = ctk.CTkFrame(export_frame, fg_color="transparent")
+        metrics_frame.pack(pady=5)
+        metric_vars = {}
+        for metric in METRICS:
+            metric_vars[metric] = ctk.BooleanVar(value=True)
+            ctk.CTkCheckBox(
+                metrics_frame,
+                text=METRIC_LABELS[metric],
+                variable=metric_vars[metric]
+            ).pack(side="left", padx=5)
+        
+        progress_bar = ctk.CTkProgressBar(export_frame)
+        progress_bar.set(0)
+        progress_bar.pack(fill="x", padx=10, pady=(10, 5))
+        status_label = ctk.CTkLabel(export_frame, text="", font=ctk.CTkFont(size=12))
+        status_label.pack(pady=(0, 5))
+        
+        buttons_frame = ctk.CTkFrame(export_frame, fg_color="transparent")
+        buttons_frame.pack(pady=10)
+        
+        def poll(job):
+            # The dashboard may have been closed while the export runs
+            if not progress_bar.winfo_exists():
+                return
+            progress_bar.set(job.progress())
+            if not job.done:
+                status_label.configure(text=f"Exported {job.written} rows...")
+                self.after(100, poll, job)
+                return
+            export_button.configure(state="normal")
+            if job.error:
+                status_label.configure(text="")
+                messagebox.showerror("Export Error", f"Failed to export data: {job.error}")
+            elif job.cancelled.is_set():
+                status_label.configure(text="Export cancelled")
+            else:
+                status_label.configure(text=f"Exported {job.written} rows to {os.path.basename(job.path)}")
+                
+        def start_export():
+            source, format_type = kinds[kind_var.get()]
+            start, end = start_entry.get().strip(), end_entry.get().strip()
+            for day in (start, end):
+                if day and not self.is_valid_date(day):
+                    messagebox.showerror("Error", "Please enter dates in YYYY-MM-DD format")
+                    return
+            if start and end and start > end:
+                messagebox.showerror("Error", "The start date must not be after the end date")
+                return
+            metrics = [metric for metric in METRICS if metric_vars[metric].get()]
+            if source == "daily" and not metrics:
+                messagebox.showerror("Error", "Please select at least one metric")
+                return
             
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
+            job = self.export_data(format_type, source, start or None, end or None, metrics)
+            if job:
+                export_button.configure(state="disabled")
+                progress_bar.set(0)
+                poll(job)
                 
-                # Write header
-                writer.writerow(['Date', 'Focus Sessions', 'Focus Time (min)', 'Tasks Completed', 'Productivity Score'])
+        def cancel_export():
+            if self.export_job and not self.export_job.done:
+                self.export_job.cancel()
                 
-                # Write daily stats
-                for date, stats in self.productivity_data.daily_stats.items():
-                    writer.writerow([
-                        date,
-                        stats['focus_sessions'],
-                        stats['focus_time'],
-                        stats['tasks_completed'],
-                        f"{stats['productivity_score']:.1f}"
-                    ])
-                    
-            messagebox.showinfo("Export Successful", f"Data exported to {filename}")
-            
+        export_button = ctk.CTkButton(buttons_frame, text="Export...", command=start_export)
+        export_button.pack(side="left", padx=5)
+        ctk.CTkButton(buttons_frame, text="Cancel", command=cancel_export).pack(side="left", padx=5)
+        
+    def export_data(self, format_type="csv", source="daily", start_day=None, end_day=None, metrics=METRICS, path=None):
+        """Start exporting daily statistics or logged sessions on a background thread.
+
+        Asks for a file name unless path is given. Returns the running ExportJob,
+        or None if nothing was started.
+        """
+        if format_type not in FORMATS:
+            messagebox.showinfo("Export", "PDF export coming soon!")
+            return None
+        if self.export_job and not self.export_job.done:
+            messagebox.showinfo("Export", "An export is already running")
+            return None
+        if path is None:
+            path = filedialog.asksaveasfilename(
+                parent=self,
+                initialfile=f"pomodoro_{source}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format_type}",
+                defaultextension=f".{format_type}",
+                filetypes=[("CSV files", "*.csv")] if format_type == "csv" else [("JSON Lines files", "*.jsonl")]
+            )
+            if not path:
+                return None
+                
+        try:
+            if source == "sessions":
+                job = ExportJob(path, SESSION_FIELDS, SESSION_LABELS, format_type,
+                                total=session_count(self.session_log.path))
+                rows = session_rows(job.counted(self.session_log), start_day, end_day)
+            else:
+                # The worker reads a copy of the range's columns, not the live stats
+                self.productivity_data.load_history()
+                stop_day = (datetime.strptime(end_day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d") if end_day else None
+                days = self.productivity_data.daily_stats.slice(start_day, stop_day)
+                job = ExportJob(
+                    path,
+                    ("date", *metrics),
+                    ("Date", *(METRIC_LABELS[metric] for metric in metrics)),
+                    format_type,
+                    total=days.count,
+                    footer=self.range_total_rows(days, metrics, start_day, end_day) if format_type == "csv" else ()
+                )
+                rows = daily_rows(days, metrics)
+            self.export_job = job.start(rows)
+            return job
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export data: {str(e)}")
+            return None
             
+    def range_total_rows(self, days, metrics, start_day=None, end_day=None):
+        """CSV summary rows for the exported days: totals and per-day averages over the calendar range.
+
+        The range is the one asked for; an open end falls back to the first or last exported day.
+        """
+        first, last = days.present.find(1), days.present.rfind(1)
+        if first >= 0:
+            start_day = start_day or day_key(days.first + first)
+            end_day = end_day or day_key(days.first + last)
+        if not start_day or not end_day:
+            return ()
+        totals = days.range_totals(start_day, end_day)
+        if not totals["days"]:
+            return ()
+        return (
+            [f"Total {start_day} to {end_day}",
+             *("" if metric == "productivity_score" else totals[metric] for metric in metrics)],
+            [f"Daily Average ({totals['days']} days)",
+             *(f"{totals[metric] / totals['days']:.1f}" for metric in metrics)]
+        )
+        
     def toggle_always_on_top(self):
         """Toggle always on top window state"""
         self.always_on_top = not self.always_on_top
@@ -2435,6 +3472,16 @@ class PomodoroStrike(ctk.CTk):
         """Handle window resize events"""
         # This method can be used for responsive design adjustments
         pass
+        
+    def on_unmap(self, event):
+        """Handle the main window being minimized or withdrawn"""
+        if event.widget is self and hasattr(self, 'progress_ring'):
+            self.progress_ring.suspend_animation("minimized")
+            
+    def on_map(self, event):
+        """Handle the main window being shown again"""
+        if event.widget is self and hasattr(self, 'progress_ring'):
+            self.progress_ring.resume_animation("minimized")
 
     def update_sidebar_stats(self):
         """Update sidebar statistics"""
@@ -2450,7 +3497,7 @@ class PomodoroStrike(ctk.CTk):
             self.sidebar_sessions.configure(text=str(self.sessions))
         
         # Update tasks completed
-        completed_tasks = sum(1 for todo in self.todos if todo.completed)
+        completed_tasks = self.todos.completed_count
         if hasattr(self, 'sidebar_tasks'):
             self.sidebar_tasks.configure(text=str(completed_tasks))
         
@@ -2460,7 +3507,7 @@ class PomodoroStrike(ctk.CTk):
             
     def update_total_time_display(self):
         # This method is now handled by update_sidebar_stats
-        self.update_sidebar_stats()
+        self.ui_updates.mark_dirty("sidebar_stats")
 
     def start_update_checker(self):
         """Start background update checker"""
@@ -2511,5 +3558,12 @@ class PomodoroStrike(ctk.CTk):
         )
 
 if __name__ == "__main__":
+    # One process owns the data files; a second launch brings that window forward instead
+    instance = SingleInstance(get_data_path("pomodoro_strike.lock"))
+    if not instance.acquire():
+        if not instance.activate_running():
+            print("Pomodoro Strike is already running")
+        sys.exit(0)
     app = PomodoroStrike()
+    instance.listen(app.request_activation)
     app.mainloop() 
\ No newline at end of file
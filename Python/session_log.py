@@ -0,0 +1,186 @@
+"""
+Session history for Pomodoro Strike
+Append-only binary log of sessions and the rollups derived from it
+"""
+
+import os
+import struct
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+MAGIC = b"PSSLOG01"
+
+# start, end (epoch seconds), kind, planned seconds, pause count, paused seconds, task id
+RECORD = struct.Struct("<ddBIHIq")
+
+# Record kinds; a completed task is logged as an instantaneous record
+KINDS = ("pomodoro", "short_break", "long_break", "task")
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+SessionRecord = namedtuple(
+    "SessionRecord",
+    "start end kind planned pause_count paused task_id"
+)
+
+
+def session_record(start, end, kind, planned=0, pause_count=0, paused=0, task_id=0):
+    """Build a record; times are epoch seconds and durations whole seconds"""
+    return SessionRecord(float(start), float(end), kind, int(planned), int(pause_count), int(paused), int(task_id or 0))
+
+
+class SessionLog:
+    """Fixed-size binary records appended to one file.
+
+    Each record is RECORD.size bytes, so appending never rewrites earlier
+    data and reading is a single streaming pass. A partial record left by a
+    crash mid-append is ignored when reading and cut off before the next
+    append.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def append(self, record):
+        if self.file is None:
+            self.file = self._open_for_append()
+        self.file.write(RECORD.pack(
+            record.start, record.end, KIND_CODES[record.kind], record.planned,
+            record.pause_count, record.paused, record.task_id
+        ))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _open_for_append(self):
+        f = open(self.path, "a+b")
+        size = f.seek(0, os.SEEK_END)
+        if size < len(MAGIC):
+            # Empty, or a crash cut off the header right after the file was created
+            f.truncate(0)
+            f.write(MAGIC)
+        else:
+            whole = len(MAGIC) + (size - len(MAGIC)) // RECORD.size * RECORD.size
+            if whole != size:
+                f.truncate(whole)
+        return f
+
+    def __iter__(self):
+        """Stream every complete record, oldest first"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                print(f"Ignoring unrecognised session log {self.path}")
+                return
+            chunk_size = RECORD.size * 4096
+            while True:
+                chunk = f.read(chunk_size)
+                whole = len(chunk) - len(chunk) % RECORD.size
+                for start, end, code, planned, pause_count, paused, task_id in RECORD.iter_unpack(chunk[:whole]):
+                    if code < len(KINDS):
+                        yield SessionRecord(start, end, KINDS[code], planned, pause_count, paused, task_id)
+                if len(chunk) < chunk_size:
+                    return
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def empty_focus_matrix():
+    """Focus minutes per weekday (Monday first) and hour of day"""
+    return [[0.0] * 24 for _ in range(7)]
+
+
+class RollupMaterializer:
+    """Maintains daily, weekly, monthly, hourly and heatmap rollups from session records.
+
+    apply() folds in one record as it is logged; rebuild() clears the chosen
+    rollups and replays a record stream in one pass. The rollups are the
+    stats dicts owned by ProductivityData, so the rest of the app reads them
+    as before. Only focus sessions count towards focus time and sessions;
+    task records only count towards tasks completed. The heatmap spreads a
+    session's focus minutes over the weekday and hour cells between its
+    start and end, in proportion to the time spent in each, since pauses
+    are not located within the session.
+    """
+
+    ROLLUPS = ("daily", "weekly", "monthly", "hourly", "heatmap")
+
+    def __init__(self, data):
+        self.data = data  # ProductivityData
+        self.period_keys = {}  # date -> (day, week, month) keys, so replays format each day once
+
+    def apply(self, record, rollups=ROLLUPS):
+        ended = datetime.fromtimestamp(record.end)
+        focus_time = record.planned // 60 if record.kind == "pomodoro" else 0
+        focus_sessions = 1 if record.kind == "pomodoro" else 0
+        tasks_completed = 1 if record.kind == "task" else 0
+        if not focus_sessions and not tasks_completed:
+            return
+
+        day_key, week_key, month_key = self.keys_for(ended)
+        if "daily" in rollups:
+            stats = self.data.daily_stats[day_key]
+            self._add(stats, focus_time, focus_sessions, tasks_completed)
+            stats["productivity_score"] = float(self.data.calculate_productivity_score(
+                int(stats["focus_time"]),
+                int(stats["tasks_completed"]),
+                int(stats["focus_sessions"])
+            ))
+        if "weekly" in rollups:
+            self._add(self.data.weekly_stats[week_key], focus_time, focus_sessions, tasks_completed)
+        if "monthly" in rollups:
+            self._add(self.data.monthly_stats[month_key], focus_time, focus_sessions, tasks_completed)
+        if "hourly" in rollups and focus_sessions:
+            self.data.best_hours[ended.hour] += 1
+        if "heatmap" in rollups and focus_sessions:
+            self._add_focus_minutes(datetime.fromtimestamp(record.start), ended, record.planned / 60)
+
+    def _add_focus_minutes(self, started, ended, minutes):
+        """Spread focus minutes over the weekday x hour cells from started to ended"""
+        matrix = self.data.focus_matrix
+        span = (ended - started).total_seconds()
+        if span <= 0:
+            matrix[ended.weekday()][ended.hour] += minutes
+            return
+        moment = started
+        while moment < ended:
+            boundary = moment.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            until = min(boundary, ended)
+            matrix[moment.weekday()][moment.hour] += minutes * (until - moment).total_seconds() / span
+            moment = until
+
+    def keys_for(self, moment):
+        """Daily, weekly and monthly stats keys for a datetime"""
+        day = moment.date()
+        keys = self.period_keys.get(day)
+        if keys is None:
+            keys = (day.strftime("%Y-%m-%d"), day.strftime("%Y-W%U"), day.strftime("%Y-%m"))
+            self.period_keys[day] = keys
+        return keys
+
+    @staticmethod
+    def _add(stats, focus_time, focus_sessions, tasks_completed):
+        stats["focus_time"] += focus_time
+        stats["focus_sessions"] += focus_sessions
+        stats["tasks_completed"] += tasks_completed
+
+    def rebuild(self, records, rollups=ROLLUPS):
+        """Recompute rollups from scratch in a single pass over records"""
+        if "daily" in rollups:
+            self.data.daily_stats.clear()
+        if "weekly" in rollups:
+            self.data.weekly_stats.clear()
+        if "monthly" in rollups:
+            self.data.monthly_stats.clear()
+        if "hourly" in rollups:
+            self.data.best_hours.clear()
+        if "heatmap" in rollups:
+            self.data.focus_matrix = empty_focus_matrix()
+        for record in records:
+            self.apply(record, rollups)
@@ -0,0 +1,215 @@
+"""
+SQLite storage backend for Pomodoro Strike
+Tasks and productivity history in one WAL-mode database; sessions stay in
+the session log
+"""
+
+import json
+import sqlite3
+import time
+from datetime import date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    category TEXT,
+    priority TEXT,
+    due_date TEXT,
+    estimated_time INTEGER NOT NULL DEFAULT 0,
+    actual_time INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks (completed, priority, due_date);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY,
+    focus_sessions INTEGER NOT NULL DEFAULT 0,
+    focus_time INTEGER NOT NULL DEFAULT 0,
+    tasks_completed INTEGER NOT NULL DEFAULT 0,
+    productivity_score REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS period_stats (
+    period TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    focus_sessions INTEGER NOT NULL DEFAULT 0,
+    focus_time INTEGER NOT NULL DEFAULT 0,
+    tasks_completed INTEGER NOT NULL DEFAULT 0,
+    productivity_score REAL NOT NULL DEFAULT 0
+);
+"""
+
+TASK_COLUMNS = ("id", "text", "completed", "created_at", "category", "priority",
+                "due_date", "estimated_time", "actual_time")
+STATS_COLUMNS = ("focus_sessions", "focus_time", "tasks_completed", "productivity_score")
+
+# Productivity fields that are not per-day rows, stored as JSON in meta
+PRODUCTIVITY_META_KEYS = (
+    "focus_streak", "longest_streak", "daily_goals", "achievements", "best_hours", "focus_matrix"
+)
+
+
+class SQLiteStore:
+    """Optional replacement for the JSON data files.
+
+    Every save is a single-row upsert inside its own transaction, and daily
+    statistics are keyed by ISO date so date-range queries are primary key
+    range scans. The database runs in WAL mode so readers never block the
+    writer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # Meta values
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self._set_meta(key, value)
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value))
+        )
+
+    @property
+    def migrated_at(self):
+        """Wall-clock time of the last import from the JSON files, or None"""
+        return self.get_meta("migrated_at")
+
+    # Tasks
+
+    def load_todos(self):
+        """Todo dicts in creation order"""
+        rows = self.conn.execute(f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY id")
+        return [dict(row, completed=bool(row["completed"])) for row in rows]
+
+    def put_todo(self, todo_data):
+        with self.conn:
+            self._put_todo(todo_data)
+
+    def _put_todo(self, todo_data):
+        placeholders = ", ".join("?" for _ in TASK_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in TASK_COLUMNS[1:])
+        self.conn.execute(
+            f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}",
+            [todo_data[column] for column in TASK_COLUMNS]
+        )
+
+    def delete_todo(self, todo_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (todo_id,))
+
+    # Statistics
+
+    def put_daily_stats(self, day, stats):
+        with self.conn:
+            self._put_stats("daily_stats", "day", day, stats)
+
+    def put_period_stats(self, period, kind, stats):
+        with self.conn:
+            self._put_stats("period_stats", "period", period, stats, kind=kind)
+
+    def _put_stats(self, table, key_column, key, stats, **extra):
+        columns = (key_column,) + tuple(extra) + STATS_COLUMNS
+        values = [key] + list(extra.values()) + [stats.get(column, 0) for column in STATS_COLUMNS]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({key_column}) DO UPDATE SET {updates}",
+            values
+        )
+
+    def save_productivity_meta(self, productivity):
+        """Store the scalar/list fields of a productivity data dict"""
+        with self.conn:
+            for key in PRODUCTIVITY_META_KEYS:
+                if key in productivity:
+                    self._set_meta(key, productivity[key])
+
+    def daily_dict(self, since=None, before=None):
+        """Days from since up to but not including before, as a {day: stats} dict"""
+        query = f"SELECT day, {', '.join(STATS_COLUMNS)} FROM daily_stats"
+        clauses, params = [], []
+        if since:
+            clauses.append("day >= ?")
+            params.append(since)
+        if before:
+            clauses.append("day < ?")
+            params.append(before)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        return {row["day"]: {column: row[column] for column in STATS_COLUMNS}
+                for row in self.conn.execute(query, params)}
+
+    def range_totals(self, start_day, end_day):
+        """Summed statistics over a date range (inclusive), plus the number of calendar days"""
+        row = self.conn.execute(
+            "SELECT "
+            + ", ".join(f"COALESCE(SUM({column}), 0) AS {column}" for column in STATS_COLUMNS)
+            + " FROM daily_stats WHERE day BETWEEN ? AND ?",
+            (start_day, end_day)
+        ).fetchone()
+        totals = dict(row)
+        totals["days"] = max(0, (date.fromisoformat(end_day) - date.fromisoformat(start_day)).days + 1)
+        return totals
+
+    def load_productivity(self, since=None):
+        """Productivity data in the same shape as productivity_data.json, daily stats from since onwards"""
+        data = {}
+        for key in PRODUCTIVITY_META_KEYS:
+            value = self.get_meta(key)
+            if value is not None:
+                data[key] = value
+        data["daily_stats"] = self.daily_dict(since)
+        for kind in ("weekly", "monthly"):
+            rows = self.conn.execute(
+                f"SELECT period, {', '.join(STATS_COLUMNS)} FROM period_stats WHERE kind = ?", (kind,)
+            )
+            data[f"{kind}_stats"] = {row["period"]: {column: row[column] for column in STATS_COLUMNS}
+                                     for row in rows}
+        return data
+
+    # Migration
+
+    def migrate_from_json(self, todos, total_focus_time, productivity):
+        """Import the JSON data files in a single transaction.
+
+        The files replace the tasks and statistics already in the database,
+        so importing again after the JSON files were used picks up their
+        changes without leaving deleted tasks behind.
+        """
+        with self.conn:
+            for table in ("tasks", "daily_stats", "period_stats"):
+                self.conn.execute(f"DELETE FROM {table}")
+            for todo_data in todos:
+                self._put_todo(todo_data)
+            self._set_meta("total_focus_time", total_focus_time)
+            for key in PRODUCTIVITY_META_KEYS:
+                if key in productivity:
+                    self._set_meta(key, productivity[key])
+            for day, stats in productivity.get("daily_stats", {}).items():
+                self._put_stats("daily_stats", "day", day, stats)
+            for kind in ("weekly", "monthly"):
+                for period, stats in productivity.get(f"{kind}_stats", {}).items():
+                    self._put_stats("period_stats", "period", period, stats, kind=kind)
+            self._set_meta("migrated_at", time.time())
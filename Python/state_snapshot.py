@@ -0,0 +1,83 @@
+"""
+Binary state snapshot for Pomodoro Strike
+Versioned, marshal-encoded copy of the app state that is read in one pass
+at startup; the JSON files stay the source of truth and export format
+"""
+
+import marshal
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"PSSNAP\r\n"
+
+# magic, schema version, payload length, payload CRC-32
+HEADER = struct.Struct("<8sHII")
+
+SCHEMA_VERSION = 1
+
+# Upgrade functions keyed by the schema version they upgrade from. Each one
+# takes the decoded state of that version and returns the next version's.
+UPGRADES = {}
+
+
+def file_signature(path):
+    """(size, mtime) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def source_signatures(paths):
+    return {os.path.basename(path): file_signature(path) for path in paths}
+
+
+def write_snapshot(path, state, sources):
+    """Atomically write state, stamped with the current signatures of the source files"""
+    payload = marshal.dumps({"sources": source_signatures(sources), "state": state})
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, SCHEMA_VERSION, len(payload), zlib.crc32(payload)))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path, sources):
+    """State from the snapshot, upgraded to SCHEMA_VERSION.
+
+    Returns None if there is no usable snapshot, it cannot be upgraded, or
+    any source file changed since it was written, in which case the caller
+    loads the JSON files.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, version, length, checksum = HEADER.unpack_from(view)
+            payload = view[HEADER.size:HEADER.size + length]
+    except (OSError, ValueError, struct.error):
+        return None
+    if magic != MAGIC or len(payload) != length or zlib.crc32(payload) != checksum:
+        print(f"Ignoring damaged state snapshot {path}")
+        return None
+    if version > SCHEMA_VERSION:
+        return None  # written by a newer version
+
+    try:
+        snapshot = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("sources") != source_signatures(sources):
+        return None
+
+    state = snapshot["state"]
+    while version < SCHEMA_VERSION:
+        upgrade = UPGRADES.get(version)
+        if upgrade is None:
+            return None  # too old to upgrade
+        state = upgrade(state)
+        version += 1
+    return state
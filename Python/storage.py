@@ -0,0 +1,342 @@
+"""
+Storage helpers for Pomodoro Strike
+Atomic JSON files, write-behind saving, yearly history files and an
+append-only journal for todos
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Write JSON so that readers see either the old or the new file, never a partial one"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class WriteBehindFile:
+    """Saves a JSON document on a background thread, coalescing rapid changes.
+
+    save() only records the latest data; the worker writes it atomically once
+    delay seconds have passed since the first unsaved change, so a burst of
+    changes (e.g. dragging a slider) costs one write. flush() writes anything
+    pending immediately on the caller's thread and should be called on exit.
+    """
+
+    def __init__(self, path, delay=0.5, **dump_kwargs):
+        self.path = path
+        self.delay = delay
+        self.dump_kwargs = dump_kwargs
+        self.pending = None
+        self.due = None
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()  # one write at a time, in order
+        self.thread = None
+
+    def save(self, data):
+        """Schedule data to be written; pass a copy the caller will not mutate"""
+        with self.condition:
+            if self.pending is None:
+                self.due = time.monotonic() + self.delay
+            self.pending = data
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def flush(self):
+        """Write pending data now"""
+        with self.write_lock:
+            with self.condition:
+                data = self.pending
+                self.pending = None
+            if data is None:
+                return
+            try:
+                atomic_write_json(self.path, data, **self.dump_kwargs)
+            except OSError as e:
+                print(f"Failed to write {self.path}: {e}")
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                while self.pending is not None and time.monotonic() < self.due:
+                    self.condition.wait(self.due - time.monotonic())
+            self.flush()
+
+
+class PersistenceWorker:
+    """Single background thread that serializes and writes JSON files in order.
+
+    submit() queues a snapshot and returns at once. While a file is still
+    waiting to be written, a newer snapshot replaces the queued one instead of
+    adding another job, and the queue is bounded so a stalled disk applies
+    backpressure rather than growing memory. submit_call() queues other file
+    work, such as merging into an existing file, to run in order with the
+    writes; a snapshot submitted after such a call is never folded into a
+    write queued before it. stats() reports the current queue depth and how
+    long writes take from submit to fsync.
+    """
+
+    def __init__(self, maxsize=16, slow_write=0.25):
+        self.jobs = queue.Queue(maxsize)
+        self.pending = {}       # path -> [data, dump_kwargs, submitted_at] of its queued write
+        self.lock = threading.Lock()
+        self.slow_write = slow_write  # seconds; slower writes are logged
+        self.writes = 0
+        self.coalesced = 0
+        self.last_write_latency = None
+        self.max_write_latency = 0.0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data, **dump_kwargs):
+        """Queue data to be written atomically to path"""
+        with self.lock:
+            write = self.pending.get(path)
+            if write is not None:
+                write[:] = [data, dump_kwargs, time.monotonic()]
+                self.coalesced += 1
+                return
+            write = self.pending[path] = [data, dump_kwargs, time.monotonic()]
+        self.jobs.put((path, write))
+
+    def submit_call(self, function, *args):
+        """Queue function(*args) to run on the worker after the jobs already queued"""
+        with self.lock:
+            self.pending.clear()  # later snapshots must be written after the call
+        self.jobs.put((function, args))
+
+    def flush(self):
+        """Wait until everything submitted so far has been written"""
+        self.jobs.join()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "queue_depth": self.jobs.qsize(),
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "last_write_latency": self.last_write_latency,
+                "max_write_latency": self.max_write_latency
+            }
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if callable(job[0]):
+                    self._call(*job)
+                else:
+                    self._write(*job)
+            finally:
+                self.jobs.task_done()
+
+    def _call(self, function, args):
+        try:
+            function(*args)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Failed to run {function.__name__}: {e}")
+
+    def _write(self, path, write):
+        try:
+            with self.lock:
+                if self.pending.get(path) is write:
+                    del self.pending[path]
+                data, dump_kwargs, submitted_at = write
+            atomic_write_json(path, data, **dump_kwargs)
+            latency = time.monotonic() - submitted_at
+            with self.lock:
+                self.writes += 1
+                self.last_write_latency = latency
+                self.max_write_latency = max(self.max_write_latency, latency)
+            if latency > self.slow_write:
+                print(f"Slow write of {path}: {latency * 1000:.0f} ms, "
+                      f"{self.jobs.qsize()} writes queued")
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Failed to write {path}: {e}")
+
+
+class YearlyHistoryArchive:
+    """Daily stats older than the recent window, one JSON file per year.
+
+    Old days never change, so each file is written when its days leave the
+    window and only read when older history is asked for. Writing merges into
+    the year's existing file, so days archived earlier are kept even if the
+    caller only holds part of the year.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, year):
+        return os.path.join(self.directory, f"daily_{year}.json")
+
+    def years(self):
+        if not os.path.isdir(self.directory):
+            return []
+        years = []
+        for name in os.listdir(self.directory):
+            if name.startswith("daily_") and name.endswith(".json") and name[6:-5].isdigit():
+                years.append(int(name[6:-5]))
+        return sorted(years)
+
+    def read_year(self, year):
+        try:
+            with open(self.path(year), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def read(self, since=None, before=None):
+        """Days from since up to but not including before ("%Y-%m-%d" keys, None for unbounded)"""
+        days = {}
+        for year in self.years():
+            if (since and year < int(since[:4])) or (before and year > int(before[:4])):
+                continue
+            for day, stats in self.read_year(year).items():
+                if (not since or day >= since) and (not before or day < before):
+                    days[day] = stats
+        return days
+
+    def write_year(self, year, days):
+        """Store days in the year's file; days already in it and not in days are kept"""
+        os.makedirs(self.directory, exist_ok=True)
+        merged = self.read_year(year)
+        merged.update(days)
+        atomic_write_json(self.path(year), dict(sorted(merged.items())))
+
+
+class TodoJournal:
+    """Persists todos as a snapshot file plus an append-only journal of changes.
+
+    Every add, edit or delete appends one small JSON line to the journal, so
+    the cost of a save does not depend on how many todos exist. Once
+    compact_threshold records have been appended the journal is rotated aside
+    and folded into a fresh snapshot on a background thread. Loading reads the
+    snapshot and replays the rotated and current journals; replaying is
+    idempotent, so records that already made it into the snapshot are
+    harmless. A torn last line from a crash mid-append is skipped.
+
+    Appends, loading and rotating the journal happen under lock (a FileLock
+    when several processes may share the files). Folding the rotated journal
+    and writing the snapshot happen outside it, under compaction_lock, so
+    appends never wait for a snapshot rewrite and only one process folds at
+    a time. The journal is reopened for each append and compaction folds
+    what is on disk rather than this process's todos, so concurrent writers
+    merge record by record instead of overwriting each other.
+    """
+
+    def __init__(self, snapshot_path, journal_path, compact_threshold=500, lock=None, compaction_lock=None):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.rotated_path = f"{journal_path}.1"
+        self.compact_threshold = compact_threshold
+        self.lock = lock or threading.RLock()
+        self.compaction_lock = compaction_lock or threading.Lock()
+        self.records = 0  # appended by this process since the last compaction
+        self.compaction_thread = None
+
+    def load(self):
+        """Return the todo dicts in their saved order"""
+        with self.lock:
+            todos = self.read(self.rotated_path, self.journal_path)
+        self.records = 0
+        return list(todos.values())
+
+    def read(self, *journal_paths):
+        """Replay journals over the snapshot into an id -> todo dict"""
+        todos = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                for todo_data in json.load(f):
+                    todos[todo_data["id"]] = todo_data
+
+        for path in journal_paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        print(f"Skipping damaged todo journal record in {path}")
+                        continue
+                    self.apply(todos, record)
+        return todos
+
+    @staticmethod
+    def apply(todos, record):
+        if record["op"] == "put":
+            todos[record["todo"]["id"]] = record["todo"]
+        elif record["op"] == "delete":
+            todos.pop(record["id"], None)
+
+    def put(self, todo_data):
+        """Record that a todo was added or changed"""
+        self.append({"op": "put", "todo": todo_data})
+
+    def delete(self, todo_id):
+        """Record that a todo was deleted"""
+        self.append({"op": "delete", "id": todo_id})
+
+    def append(self, record):
+        with self.lock:
+            with open(self.journal_path, "a+", encoding="utf-8") as f:
+                # Terminate a torn last line so it does not swallow the next record
+                if f.tell() > 0:
+                    f.seek(f.tell() - 1)
+                    if f.read(1) != "\n":
+                        f.write("\n")
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self.records += 1
+
+        if self.records >= self.compact_threshold:
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into a new snapshot in the background"""
+        if self.compaction_thread and self.compaction_thread.is_alive():
+            return
+        self.records = 0
+        self.compaction_thread = threading.Thread(target=self.fold_journal, daemon=True)
+        self.compaction_thread.start()
+
+    def fold_journal(self):
+        if not self.compaction_lock.acquire(blocking=False):
+            return  # another thread or process is folding; our records wait for the next round
+        try:
+            with self.lock:
+                # Start a fresh journal; a rotated journal left by a failed
+                # compaction is folded first and the rest waits
+                if os.path.exists(self.journal_path) and not os.path.exists(self.rotated_path):
+                    os.replace(self.journal_path, self.rotated_path)
+                if not os.path.exists(self.rotated_path):
+                    return
+
+            # Only folders rotate or remove the rotated journal, so it is stable here,
+            # and readers replay it over either snapshot until it is removed
+            todos = self.read(self.rotated_path)
+            atomic_write_json(self.snapshot_path, list(todos.values()))
+            with self.lock:
+                os.remove(self.rotated_path)
+        except OSError as e:
+            print(f"Todo journal compaction failed: {e}")
+        finally:
+            self.compaction_lock.release()
+
+    def close(self):
+        """Wait for a running compaction to finish"""
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
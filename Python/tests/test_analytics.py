@@ -0,0 +1,126 @@
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+import analytics
+from analytics import FocusAnalytics
+from daily_stats import DailyStats
+
+TODAY = date(2026, 10, 17)
+METRICS = ("focus_sessions", "focus_time", "tasks_completed", "productivity_score")
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """Run a test once with the plain Python code and once with NumPy, if installed"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(analytics, "np", None)
+    return request.param
+
+
+def make_history(days=400, seed=3):
+    """Random days with gaps, ending two days before TODAY"""
+    random.seed(seed)
+    history = {}
+    for offset in range(2, days):
+        if random.random() < 0.2:
+            continue
+        sessions = random.choice((0, 0, 1, 3, 6))
+        history[(TODAY - timedelta(days=offset)).isoformat()] = {
+            "focus_sessions": sessions,
+            "focus_time": sessions * 25,
+            "tasks_completed": random.randint(0, 4),
+            "productivity_score": round(random.random() * 100, 1)
+        }
+    return history
+
+
+def calendar_values(history, metric):
+    """The metric for every calendar day from the first in history to TODAY, zero when missing"""
+    first = date.fromisoformat(min(history))
+    return [history.get((first + timedelta(days=i)).isoformat(), {}).get(metric, 0)
+            for i in range((TODAY - first).days + 1)]
+
+
+def as_list(values):
+    return [float(value) for value in values]
+
+
+def test_matches_brute_force(backend):
+    history = make_history()
+    best_hours = {hour: (hour * 7) % 11 for hour in range(24)}
+    focus = FocusAnalytics(DailyStats(history), best_hours, TODAY)
+    values = calendar_values(history, "focus_time")
+
+    for window in (1, 7, 30):
+        expected = [sum(values[max(0, i - window + 1):i + 1]) / (i + 1 - max(0, i - window + 1))
+                    for i in range(len(values))]
+        assert as_list(focus.rolling_average("focus_time", window)) == pytest.approx(expected)
+        assert focus.latest_average("focus_time", window) == pytest.approx(sum(values[-window:]) / window)
+
+    week = focus.week_over_week("focus_time")
+    assert (week["this_week"], week["last_week"]) == (sum(values[-7:]), sum(values[-14:-7]))
+
+    blocks = [sum(values[len(values) - 7 * (i + 1):len(values) - 7 * i]) for i in range(len(values) // 7)][::-1]
+    assert as_list(focus.weekly_deltas("focus_time")) == [b - a for a, b in zip(blocks, blocks[1:])]
+
+    active = [stats["focus_time"] for stats in history.values() if stats["focus_sessions"]]
+    cuts = statistics.quantiles(active, n=100, method="inclusive")
+    assert focus.percentiles("focus_time", (25, 50, 90)) == pytest.approx({p: cuts[p - 1] for p in (25, 50, 90)})
+
+    weekdays = [0.0] * 7
+    for day, stats in history.items():
+        weekdays[date.fromisoformat(day).weekday()] += stats["focus_time"]
+    assert focus.weekday_distribution("focus_time") == pytest.approx(weekdays)
+
+    sessions = calendar_values(history, "focus_sessions")
+    runs, run = [], 0
+    for count in sessions:
+        run = run + 1 if count else 0
+        runs.append(run)
+    assert focus.streaks() == (0, max(runs))  # no session yesterday or today
+
+    assert focus.top_hours(2) == [(hour, best_hours[hour]) for hour in sorted(range(24), key=lambda h: -best_hours[h])[:2]]
+
+
+def test_current_streak_counts_until_today_ends(backend):
+    history = {(TODAY - timedelta(days=offset)).isoformat(): {"focus_sessions": 1, "focus_time": 25}
+               for offset in range(1, 5)}
+    assert FocusAnalytics(DailyStats(history), today=TODAY).streaks() == (4, 4)
+
+    history[TODAY.isoformat()] = {"focus_sessions": 2, "focus_time": 50}
+    assert FocusAnalytics(DailyStats(history), today=TODAY).streaks() == (5, 5)
+
+
+def test_empty_history(backend):
+    focus = FocusAnalytics(DailyStats(), today=TODAY)
+    assert focus.latest_average("focus_time", 7) == 0.0
+    assert focus.percentiles("focus_time", (50,)) == {50: 0.0}
+    assert focus.streaks() == (0, 0)
+    assert focus.weekday_distribution() == [0.0] * 7
+
+
+def test_numpy_and_python_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    history = make_history(seed=7)
+    results = []
+    for numpy in (analytics.np, None):
+        monkeypatch.setattr(analytics, "np", numpy)
+        focus = FocusAnalytics(DailyStats(history), today=TODAY)
+        results.append((
+            [as_list(focus.rolling_average(metric, 7)) for metric in METRICS],
+            as_list(focus.weekly_deltas("focus_time")),
+            focus.percentiles(),
+            focus.weekday_distribution("tasks_completed"),
+            focus.streaks()
+        ))
+    numpy_result, python_result = results
+    assert numpy_result[0] == [pytest.approx(column) for column in python_result[0]]
+    assert numpy_result[1] == pytest.approx(python_result[1])
+    assert numpy_result[2] == pytest.approx(python_result[2])
+    assert numpy_result[3] == pytest.approx(python_result[3])
+    assert numpy_result[4] == python_result[4]
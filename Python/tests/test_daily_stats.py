@@ -0,0 +1,124 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from daily_stats import METRICS, DailyStats
+
+START = date(2026, 1, 1)
+
+
+def day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+
+def brute_totals(stats, start_day, end_day):
+    totals = {metric: 0 for metric in METRICS}
+    for key, row in stats.to_dict().items():
+        if start_day <= key <= end_day:
+            for metric in METRICS:
+                totals[metric] += row[metric]
+    totals["days"] = max(0, (date.fromisoformat(end_day) - date.fromisoformat(start_day)).days + 1)
+    return totals
+
+
+def check_ranges(stats, offsets=range(-5, 45, 3)):
+    """Compare range_totals with a scan of every day, including ranges outside the stored span"""
+    for low in offsets:
+        for high in offsets:
+            expected = brute_totals(stats, day(low), day(high))
+            assert stats.range_totals(day(low), day(high)) == pytest.approx(expected), (low, high)
+
+
+def session_day(sessions):
+    return {"focus_sessions": sessions, "focus_time": sessions * 25, "tasks_completed": 1,
+            "productivity_score": sessions * 10.5}
+
+
+def make_stats():
+    return DailyStats({day(offset): session_day(offset % 4) for offset in range(10, 20)})
+
+
+def test_newest_day_update_keeps_prefix_current():
+    stats = make_stats()
+    check_ranges(stats)
+    assert stats.prefix is not None
+
+    newest = stats[day(19)]
+    newest["focus_sessions"] += 1
+    newest["focus_time"] += 25
+    newest["productivity_score"] = 99.5
+    assert stats.prefix is not None  # updated in place rather than rebuilt
+    check_ranges(stats)
+
+
+def test_older_day_update_drops_prefix():
+    stats = make_stats()
+    check_ranges(stats)
+    stats[day(12)]["focus_time"] += 50
+    assert stats.prefix is None
+    check_ranges(stats)
+
+
+def test_appended_days_extend_existing_prefix():
+    stats = make_stats()
+    check_ranges(stats)
+
+    # A new day after a gap, then sessions on it
+    stats[day(25)]["focus_sessions"] += 2
+    assert stats.prefix is not None
+    stats[day(25)]["focus_time"] += 50
+    stats[day(26)] = session_day(3)
+    check_ranges(stats)
+
+
+def test_prepended_history_via_load():
+    stats = make_stats()
+    check_ranges(stats)
+    stats.load({day(offset): session_day(2) for offset in range(0, 5)})
+    assert stats.first == START.toordinal()
+    check_ranges(stats)
+
+
+def test_delete_day():
+    stats = make_stats()
+    check_ranges(stats)
+    del stats[day(15)]
+    del stats[day(19)]
+    assert day(15) not in stats
+    assert len(stats) == 8
+    check_ranges(stats)
+
+    with pytest.raises(KeyError):
+        del stats[day(15)]
+
+    del stats[day(18)]["focus_time"]  # a single metric of the newest remaining day
+    check_ranges(stats)
+
+
+def test_empty_and_reversed_ranges():
+    stats = DailyStats()
+    assert stats.range_totals(day(0), day(6)) == dict({metric: 0 for metric in METRICS}, days=7)
+
+    stats = make_stats()
+    totals = stats.range_totals(day(15), day(12))
+    assert totals["days"] == 0
+    assert all(totals[metric] == 0 for metric in METRICS)
+
+
+def test_random_changes_match_brute_force():
+    random.seed(5)
+    stats = make_stats()
+    for _ in range(300):
+        action = random.random()
+        offset = random.randint(0, 40)
+        if action < 0.5:
+            stats[day(offset)]["focus_time"] += random.randint(1, 50)
+        elif action < 0.65:
+            stats[day(offset)] = session_day(random.randint(0, 6))
+        elif action < 0.75 and day(offset) in stats:
+            del stats[day(offset)]
+        elif action < 0.8:
+            stats.load({day(offset): session_day(random.randint(0, 6))})
+        low, high = sorted(random.sample(range(-5, 45), 2))
+        assert stats.range_totals(day(low), day(high)) == pytest.approx(brute_totals(stats, day(low), day(high)))
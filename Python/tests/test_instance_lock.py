@@ -0,0 +1,48 @@
+import multiprocessing
+import sys
+
+from instance_lock import FileLock, SingleInstance
+
+PROCESSES = 8
+INCREMENTS = 100
+
+
+def increment(directory):
+    lock = FileLock(str(directory / "counter.lock"))
+    counter = directory / "counter"
+    for _ in range(INCREMENTS):
+        with lock:
+            counter.write_text(str(int(counter.read_text()) + 1))
+
+
+def try_acquire(lock_path):
+    sys.exit(0 if SingleInstance(lock_path).acquire() else 1)
+
+
+def test_file_lock_serializes_processes(tmp_path):
+    (tmp_path / "counter").write_text("0")
+    processes = [multiprocessing.Process(target=increment, args=(tmp_path,)) for _ in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert int((tmp_path / "counter").read_text()) == PROCESSES * INCREMENTS
+
+
+def test_second_instance_hands_off_to_the_owner(tmp_path):
+    lock_path = str(tmp_path / "app.lock")
+    owner = SingleInstance(lock_path)
+    assert owner.acquire()
+    activated = multiprocessing.Event()
+    owner.listen(activated.set)
+
+    other = multiprocessing.Process(target=try_acquire, args=(lock_path,))
+    other.start()
+    other.join(timeout=30)
+    assert other.exitcode == 1
+
+    assert SingleInstance(lock_path).activate_running()
+    assert activated.wait(5)
+    owner.server.close()
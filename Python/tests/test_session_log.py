@@ -0,0 +1,58 @@
+from collections import defaultdict
+from datetime import datetime
+
+from daily_stats import DailyStats
+from session_log import MAGIC, RECORD, RollupMaterializer, SessionLog, empty_focus_matrix, session_record
+
+
+def test_append_recovers_from_a_torn_header(tmp_path):
+    path = tmp_path / "sessions.log"
+    path.write_bytes(MAGIC[:3])
+
+    log = SessionLog(str(path))
+    log.append(session_record(100, 1600, "pomodoro", 1500))
+    log.close()
+
+    assert [record.end for record in SessionLog(str(path))] == [1600]
+
+
+def test_append_cuts_off_a_torn_record(tmp_path):
+    path = tmp_path / "sessions.log"
+    log = SessionLog(str(path))
+    log.append(session_record(100, 1600, "pomodoro", 1500))
+    log.close()
+    with open(path, "ab") as f:
+        f.write(b"\0" * (RECORD.size // 2))
+
+    log = SessionLog(str(path))
+    log.append(session_record(1700, 2000, "short_break", 300))
+    log.close()
+
+    assert [record.kind for record in SessionLog(str(path))] == ["pomodoro", "short_break"]
+
+
+class Productivity:
+    """Just the stats RollupMaterializer writes to"""
+
+    def __init__(self):
+        self.daily_stats = DailyStats()
+        self.weekly_stats = defaultdict(lambda: {"focus_sessions": 0, "focus_time": 0, "tasks_completed": 0})
+        self.monthly_stats = defaultdict(lambda: {"focus_sessions": 0, "focus_time": 0, "tasks_completed": 0})
+        self.best_hours = defaultdict(int)
+        self.focus_matrix = empty_focus_matrix()
+
+    def calculate_productivity_score(self, focus_time, tasks_completed, sessions_completed):
+        return 0.0
+
+
+def test_heatmap_spreads_a_paused_session_over_the_hours_it_spanned():
+    # 25 minutes of focus from Tuesday 10:40 to 11:20, paused for 15 minutes somewhere
+    start = datetime(2026, 10, 13, 10, 40).timestamp()
+    end = datetime(2026, 10, 13, 11, 20).timestamp()
+    data = Productivity()
+    RollupMaterializer(data).apply(session_record(start, end, "pomodoro", 1500, 1, 900))
+
+    tuesday = data.focus_matrix[1]
+    assert abs(tuesday[10] - 12.5) < 1e-9
+    assert abs(tuesday[11] - 12.5) < 1e-9
+    assert abs(sum(map(sum, data.focus_matrix)) - 25) < 1e-9
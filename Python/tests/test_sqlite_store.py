@@ -0,0 +1,37 @@
+from sqlite_store import SQLiteStore
+
+
+def todo(todo_id, text):
+    return {
+        "id": todo_id, "text": text, "completed": False, "created_at": None, "category": "General",
+        "priority": "Medium", "due_date": None, "estimated_time": 0, "actual_time": 0
+    }
+
+
+def stats(focus_time):
+    return {"focus_sessions": 1, "focus_time": focus_time, "tasks_completed": 0, "productivity_score": 10.0}
+
+
+def test_import_again_replaces_tasks_and_stats(tmp_path):
+    store = SQLiteStore(str(tmp_path / "test.db"))
+    assert store.migrated_at is None
+
+    store.migrate_from_json(
+        [todo(1, "old"), todo(2, "deleted later")], 50,
+        {"daily_stats": {"2026-01-01": stats(25), "2026-01-02": stats(50)}, "focus_streak": 2}
+    )
+    first_import = store.migrated_at
+    assert first_import is not None
+
+    # The JSON files were used in between: one task deleted, one changed, a day added
+    store.migrate_from_json(
+        [todo(1, "changed")], 75,
+        {"daily_stats": {"2026-01-01": stats(25), "2026-01-03": stats(25)}, "focus_streak": 1}
+    )
+
+    assert [row["text"] for row in store.load_todos()] == ["changed"]
+    assert sorted(store.daily_dict()) == ["2026-01-01", "2026-01-03"]
+    assert store.get_meta("total_focus_time") == 75
+    assert store.load_productivity()["focus_streak"] == 1
+    assert store.migrated_at >= first_import
+    store.close()
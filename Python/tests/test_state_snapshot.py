@@ -0,0 +1,111 @@
+import marshal
+import os
+import zlib
+
+import pytest
+
+import state_snapshot
+from state_snapshot import HEADER, MAGIC, SCHEMA_VERSION, read_snapshot, source_signatures, write_snapshot
+
+STATE = {"settings": {"pomodoro_time": 25}, "todos": [{"id": 1, "text": "write tests"}]}
+
+
+@pytest.fixture
+def files(tmp_path):
+    source = tmp_path / "settings.json"
+    source.write_text('{"pomodoro_time": 25}')
+    return str(tmp_path / "state.snapshot"), [str(source)]
+
+
+def write_raw(path, sources, state, version=SCHEMA_VERSION, magic=MAGIC):
+    """Write a snapshot with a chosen header, as another version would"""
+    payload = marshal.dumps({"sources": source_signatures(sources), "state": state})
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(magic, version, len(payload), zlib.crc32(payload)))
+        f.write(payload)
+
+
+def test_round_trip(files):
+    path, sources = files
+    write_snapshot(path, STATE, sources)
+    assert read_snapshot(path, sources) == STATE
+
+
+def test_missing_snapshot(files):
+    path, sources = files
+    assert read_snapshot(path, sources) is None
+
+
+def test_rejects_bad_magic(files):
+    path, sources = files
+    write_raw(path, sources, STATE, magic=b"NOTSNAP!")
+    assert read_snapshot(path, sources) is None
+
+
+def test_rejects_truncated_header(files):
+    path, sources = files
+    write_snapshot(path, STATE, sources)
+    with open(path, "r+b") as f:
+        f.truncate(HEADER.size - 3)
+    assert read_snapshot(path, sources) is None
+
+
+def test_rejects_truncated_payload(files):
+    path, sources = files
+    write_snapshot(path, STATE, sources)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 5)
+    assert read_snapshot(path, sources) is None
+
+
+def test_rejects_crc_mismatch(files):
+    path, sources = files
+    write_snapshot(path, STATE, sources)
+    with open(path, "r+b") as f:
+        f.seek(HEADER.size + 10)
+        byte = f.read(1)
+        f.seek(HEADER.size + 10)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    assert read_snapshot(path, sources) is None
+
+
+def test_rejects_newer_schema(files):
+    path, sources = files
+    write_raw(path, sources, STATE, version=SCHEMA_VERSION + 1)
+    assert read_snapshot(path, sources) is None
+
+
+def test_rejects_older_schema_without_upgrade(files, monkeypatch):
+    path, sources = files
+    monkeypatch.setattr(state_snapshot, "UPGRADES", {})
+    write_raw(path, sources, STATE, version=SCHEMA_VERSION - 1)
+    assert read_snapshot(path, sources) is None
+
+
+def test_upgrades_older_schema(files, monkeypatch):
+    path, sources = files
+    monkeypatch.setattr(state_snapshot, "UPGRADES", {SCHEMA_VERSION - 1: lambda state: dict(state, upgraded=True)})
+    write_raw(path, sources, STATE, version=SCHEMA_VERSION - 1)
+    assert read_snapshot(path, sources) == dict(STATE, upgraded=True)
+
+
+def test_changed_source_invalidates(files):
+    path, sources = files
+    write_snapshot(path, STATE, sources)
+    with open(sources[0], "w") as f:
+        f.write('{"pomodoro_time": 50, "edited": true}')
+    assert read_snapshot(path, sources) is None
+
+
+def test_created_or_deleted_source_invalidates(files, tmp_path):
+    path, sources = files
+    journal = str(tmp_path / "todos.journal")
+    write_snapshot(path, STATE, sources + [journal])
+
+    with open(journal, "w") as f:
+        f.write("{}\n")
+    assert read_snapshot(path, sources + [journal]) is None
+
+    write_snapshot(path, STATE, sources + [journal])
+    os.remove(sources[0])
+    assert read_snapshot(path, sources + [journal]) is None
@@ -0,0 +1,61 @@
+import json
+import threading
+
+from storage import PersistenceWorker, YearlyHistoryArchive
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_write_year_keeps_days_already_archived(tmp_path):
+    archive = YearlyHistoryArchive(str(tmp_path / "history"))
+    archive.write_year(2024, {"2024-01-02": {"focus_time": 50}, "2024-03-01": {"focus_time": 25}})
+
+    # A caller that only holds the days since its session log began
+    archive.write_year(2024, {"2024-03-01": {"focus_time": 75}, "2024-06-01": {"focus_time": 10}})
+
+    assert archive.read_year(2024) == {
+        "2024-01-02": {"focus_time": 50},
+        "2024-03-01": {"focus_time": 75},
+        "2024-06-01": {"focus_time": 10}
+    }
+    assert list(archive.read(before="2024-03-01")) == ["2024-01-02"]
+
+
+def test_persistence_worker_runs_calls_in_order_with_writes(tmp_path):
+    worker = PersistenceWorker()
+    archive = YearlyHistoryArchive(str(tmp_path / "history"))
+    path = str(tmp_path / "productivity_data.json")
+    order = []
+    release = threading.Event()
+
+    worker.submit_call(release.wait)  # hold the worker so the jobs below queue up
+    worker.submit(path, {"version": 1})
+    worker.submit_call(lambda: order.append(("archived", read_json(path)["version"])))
+    worker.submit_call(archive.write_year, 2024, {"2024-01-02": {"focus_time": 50}})
+    worker.submit(path, {"version": 2})  # must not be folded into the write queued before the calls
+    release.set()
+    worker.flush()
+
+    assert order == [("archived", 1)]
+    assert archive.read_year(2024) == {"2024-01-02": {"focus_time": 50}}
+    assert read_json(path) == {"version": 2}
+    assert worker.stats()["writes"] == 2
+
+
+def test_persistence_worker_coalesces_queued_writes(tmp_path):
+    worker = PersistenceWorker()
+    path = str(tmp_path / "settings.json")
+    release = threading.Event()
+
+    worker.submit_call(release.wait)
+    for version in range(5):
+        worker.submit(path, {"version": version})
+    release.set()
+    worker.flush()
+
+    assert read_json(path) == {"version": 4}
+    assert worker.stats()["writes"] == 1
+    assert worker.stats()["coalesced"] == 4
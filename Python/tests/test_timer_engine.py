@@ -0,0 +1,246 @@
+import time
+from collections import defaultdict
+
+from timer_engine import CountdownTimer, PomodoroEngine
+
+
+def test_paused_countdown_uses_no_cpu():
+    ticks = []
+    timer = CountdownTimer(60, on_tick=ticks.append)
+    timer.start()
+    time.sleep(0.1)
+    timer.pause()
+    time.sleep(0.1)  # let the worker reach its wait
+
+    cpu_before = time.process_time()
+    time.sleep(3)
+    cpu_used = time.process_time() - cpu_before
+
+    ticks_while_paused = len(ticks)
+    timer.stop()
+    assert cpu_used < 0.05, f"paused timer used {cpu_used:.3f} s of CPU in 3 s"
+    assert ticks_while_paused == 0
+    assert timer.time_left() == 60
+
+
+def test_resume_after_pause_keeps_remaining_time():
+    done = []
+    timer = CountdownTimer(1, on_complete=lambda: done.append(True))
+    timer.start()
+    time.sleep(0.3)
+    timer.pause()
+    time.sleep(0.5)
+    timer.resume()
+    timer.thread.join(timeout=3)
+
+    report = timer.drift_report()
+    assert done == [True]
+    assert report["paused_time"] >= 0.5
+    assert report["completion_drift"] < 0.1
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+SETTINGS = {
+    "pomodoro_time": 25,
+    "short_break_time": 5,
+    "long_break_time": 15,
+    "auto_start": False,
+    "custom_break_interval": 4,
+    "long_break_frequency": 4
+}
+
+
+def make_engine(**settings):
+    clock = FakeClock()
+    return PomodoroEngine(dict(SETTINGS, **settings), clock=clock), clock
+
+
+def test_completion_drift_measured_when_session_completes():
+    engine, clock = make_engine()
+    engine.start()
+    clock.advance(25 * 60 + 0.25)  # the driver polls a quarter second late
+    engine.poll()
+
+    assert not engine.is_running
+    assert abs(engine.completion_drift - 0.25) < 1e-9
+
+
+def run_session(engine, clock):
+    """Start the current mode and let it run to its deadline"""
+    engine.start()
+    clock.advance(engine.remaining())
+    engine.poll()
+
+
+def test_auto_start_cycle_follows_break_rules():
+    engine, clock = make_engine(auto_start=True, custom_break_interval=2, long_break_frequency=4)
+    completed = []
+    engine.subscribe("session_complete", lambda mode, sessions: completed.append((mode, sessions)))
+
+    breaks = []
+    for _ in range(8):
+        run_session(engine, clock)
+        breaks.append(engine.mode)
+        run_session(engine, clock)
+        assert engine.mode == "pomodoro"
+
+    assert breaks == ["short_break"] * 3 + ["long_break"] + ["short_break"] * 3 + ["long_break"]
+    assert [mode for mode, _ in completed[::2]] == ["pomodoro"] * 8
+    assert [sessions for _, sessions in completed[::2]] == list(range(1, 9))
+    assert engine.total_time == 25 * 60
+
+
+def test_long_break_needs_both_interval_and_frequency():
+    engine, clock = make_engine(auto_start=True, custom_break_interval=3, long_break_frequency=2)
+    long_breaks = []
+    for _ in range(12):
+        run_session(engine, clock)
+        if engine.mode == "long_break":
+            long_breaks.append(engine.sessions)
+            assert engine.total_time == 15 * 60
+        run_session(engine, clock)
+
+    assert long_breaks == [6, 12]
+
+
+def test_without_auto_start_the_mode_stays():
+    engine, clock = make_engine()
+    run_session(engine, clock)
+    assert engine.mode == "pomodoro"
+    assert engine.sessions == 1
+    assert engine.time_left == 0
+
+
+def test_pause_and_resume_keep_remaining_time():
+    engine, clock = make_engine()
+    engine.start()
+    clock.advance(100)
+    engine.pause()
+    clock.advance(500)
+    engine.poll()
+    assert engine.is_paused
+    assert engine.remaining() == 1400
+
+    engine.resume()
+    clock.advance(1399)
+    engine.poll()
+    assert engine.is_running
+    assert engine.time_left == 1
+
+    clock.advance(1)
+    engine.poll()
+    assert not engine.is_running
+    assert engine.sessions == 1
+    assert engine.pause_count == 1
+    assert engine.paused_time == 500
+    assert engine.elapsed() == 2000
+
+
+def test_reset_after_pause_reloads_the_mode():
+    engine, clock = make_engine()
+    engine.start()
+    clock.advance(60)
+    engine.pause()
+    engine.reset()
+
+    assert not engine.is_running and not engine.is_paused
+    assert engine.time_left == engine.total_time == 1500
+    assert engine.remaining() == 1500
+
+    # The next start is a fresh session, not a resumed one
+    engine.start()
+    assert engine.deadline == clock() + 1500
+    clock.advance(1500)
+    engine.poll()
+    assert engine.sessions == 1
+    assert engine.pause_count == 0
+    assert engine.paused_time == 0
+
+
+def test_checkpoint_restore_running_session():
+    engine, clock = make_engine()
+    engine.start()
+    clock.advance(300)
+    state = engine.checkpoint(wall_clock=lambda: 50000.0)
+
+    # Restart 30 s later with a clock that has a different origin
+    restored, restored_clock = make_engine()
+    restored_clock.now = 5.0
+    restored.restore(state, wall_clock=lambda: 50030.0)
+
+    assert restored.is_running and not restored.is_paused
+    assert restored.remaining() == 1500 - 300 - 30
+    assert restored.elapsed() == 330
+
+    restored_clock.advance(restored.remaining())
+    restored.poll()
+    assert not restored.is_running
+    assert restored.sessions == 1
+    assert restored.elapsed() == 1500
+
+
+def test_checkpoint_restore_paused_session():
+    engine, clock = make_engine()
+    engine.start()
+    clock.advance(200)
+    engine.pause()
+    clock.advance(50)
+    state = engine.checkpoint(wall_clock=lambda: 50000.0)
+
+    restored, restored_clock = make_engine()
+    restored_clock.now = 5.0
+    restored.restore(state, wall_clock=lambda: 50100.0)
+
+    # Time spent closed while paused does not count down
+    assert restored.is_paused
+    assert restored.remaining() == 1300
+    restored.resume()
+    assert restored.paused_time == 150
+    assert restored.pause_count == 1
+
+    restored_clock.advance(1300)
+    restored.poll()
+    assert not restored.is_running
+    assert restored.sessions == 1
+
+
+def test_restore_after_deadline_passed_while_closed():
+    engine, clock = make_engine()
+    engine.start()
+    clock.advance(600)
+    state = engine.checkpoint(wall_clock=lambda: 50000.0)
+
+    # Reopened an hour later, long after the session's deadline
+    restored, restored_clock = make_engine()
+    restored_clock.now = 5.0
+    restored.restore(state, wall_clock=lambda: 53600.0)
+    restored.poll()
+
+    assert not restored.is_running
+    assert restored.sessions == 1
+    assert restored.ended_at == restored_clock() - (3600 - 900)
+    assert restored.elapsed() == 1500
+    assert restored.completion_drift == 3600 - 900
+
+
+def test_bulk_sessions():
+    engine, clock = make_engine(auto_start=True)
+    modes = defaultdict(int)
+    engine.subscribe("session_complete", lambda mode, sessions: modes.__setitem__(mode, modes[mode] + 1))
+
+    for _ in range(5000):
+        run_session(engine, clock)
+
+    assert engine.sessions == 2500
+    assert modes == {"pomodoro": 2500, "short_break": 1875, "long_break": 625}
+    assert engine.mode == "pomodoro"
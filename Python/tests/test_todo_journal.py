@@ -0,0 +1,80 @@
+import multiprocessing
+import threading
+import time
+
+import storage
+from instance_lock import FileLock
+from storage import TodoJournal
+
+WRITERS = 12
+RECORDS_PER_WRITER = 150
+
+
+def make_journal(directory, compact_threshold=500):
+    return TodoJournal(
+        str(directory / "todos.json"),
+        str(directory / "todos.journal"),
+        compact_threshold=compact_threshold,
+        lock=FileLock(str(directory / "todos.lock")),
+        compaction_lock=FileLock(str(directory / "todos.compact.lock"))
+    )
+
+
+def write_todos(directory, writer):
+    """One writer process: add todos, edit every other one and delete every tenth"""
+    journal = make_journal(directory, compact_threshold=25)
+    for index in range(RECORDS_PER_WRITER):
+        todo_id = writer * 10000 + index
+        journal.put({"id": todo_id, "text": f"task {index}", "completed": False})
+        if index % 2:
+            journal.put({"id": todo_id, "text": f"task {index}", "completed": True})
+        if index % 10 == 9:
+            journal.delete(todo_id)
+    journal.close()
+
+
+def test_concurrent_writers_lose_no_records(tmp_path):
+    processes = [
+        multiprocessing.Process(target=write_todos, args=(tmp_path, writer))
+        for writer in range(WRITERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    todos = {todo["id"]: todo for todo in make_journal(tmp_path).load()}
+    expected = {
+        writer * 10000 + index: bool(index % 2)
+        for writer in range(WRITERS)
+        for index in range(RECORDS_PER_WRITER)
+        if index % 10 != 9
+    }
+    assert {todo_id: todo["completed"] for todo_id, todo in todos.items()} == expected
+    assert (tmp_path / "todos.json").exists()  # compaction ran
+
+
+def test_append_does_not_wait_for_a_snapshot_rewrite(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    journal.put({"id": 1, "text": "first"})
+
+    writing = threading.Event()
+    real_write = storage.atomic_write_json
+
+    def slow_write(*args, **kwargs):
+        writing.set()
+        time.sleep(1)
+        real_write(*args, **kwargs)
+
+    monkeypatch.setattr(storage, "atomic_write_json", slow_write)
+    journal.compact()
+    assert writing.wait(5)
+
+    start = time.monotonic()
+    journal.put({"id": 2, "text": "second"})
+    elapsed = time.monotonic() - start
+    journal.close()
+
+    assert elapsed < 0.5
+    assert sorted(todo["id"] for todo in journal.load()) == [1, 2]
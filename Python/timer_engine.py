@@ -0,0 +1,435 @@
+"""
+Timer engine for Pomodoro Strike
+Headless session state machine plus a drift-free countdown driven by a
+monotonic deadline
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+
+# Settings key holding the length in minutes of each timer mode
+MODE_TIME_SETTINGS = {
+    "pomodoro": "pomodoro_time",
+    "short_break": "short_break_time",
+    "long_break": "long_break_time"
+}
+
+
+class CountdownTimer:
+    """Counts down to a monotonic deadline instead of decrementing once per sleep(1).
+
+    The remaining time is always derived from the deadline, so scheduling latency,
+    slow UI callbacks and CPU contention never accumulate. The worker thread wakes
+    on each whole-second boundary and blocks on a condition while paused.
+    """
+
+    def __init__(self, duration, on_tick=None, on_complete=None, clock=time.monotonic):
+        self.duration = duration
+        self.on_tick = on_tick            # called with whole seconds left
+        self.on_complete = on_complete
+        self.clock = clock
+
+        self.remaining = float(duration)  # seconds left while not counting down
+        self.deadline = None              # clock() value at which the countdown ends
+        self.is_paused = False
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+        # Drift measurement
+        self.ticks = 0
+        self.total_tick_latency = 0.0
+        self.max_tick_latency = 0.0
+        self.completion_drift = None
+        self.paused_time = 0.0
+        self.paused_at = None
+
+    def start(self, deadline=None):
+        """Start counting down from the remaining time, or towards an explicit deadline"""
+        with self.condition:
+            if self.thread is not None:
+                return
+            self.deadline = deadline if deadline is not None else self.clock() + self.remaining
+            self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def pause(self):
+        """Freeze the remaining time; the worker thread blocks until resumed"""
+        with self.condition:
+            if self.is_paused or self.stopped or self.deadline is None:
+                return
+            now = self.clock()
+            self.remaining = max(0.0, self.deadline - now)
+            self.is_paused = True
+            self.paused_at = now
+            self.condition.notify_all()
+
+    def resume(self, deadline=None):
+        """Continue counting down with a fresh deadline"""
+        with self.condition:
+            if not self.is_paused or self.stopped:
+                return
+            now = self.clock()
+            self.deadline = deadline if deadline is not None else now + self.remaining
+            self.paused_time += now - self.paused_at
+            self.paused_at = None
+            self.is_paused = False
+            self.condition.notify_all()
+
+    def stop(self):
+        """Stop the countdown without calling on_complete"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def time_left(self):
+        """Whole seconds left, rounded up so 00:00 is only shown on completion"""
+        with self.condition:
+            if self.is_paused or self.deadline is None:
+                remaining = self.remaining
+            else:
+                remaining = self.deadline - self.clock()
+            return max(0, math.ceil(remaining))
+
+    def drift_report(self):
+        """Measured timing accuracy of this countdown, in seconds"""
+        with self.condition:
+            return {
+                "duration": self.duration,
+                "ticks": self.ticks,
+                "mean_tick_latency": self.total_tick_latency / self.ticks if self.ticks else 0.0,
+                "max_tick_latency": self.max_tick_latency,
+                "completion_drift": self.completion_drift,
+                "paused_time": self.paused_time
+            }
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.is_paused and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+
+                now = self.clock()
+                remaining = self.deadline - now
+                if remaining <= 0:
+                    self.completion_drift = -remaining
+                    break
+
+                # Sleep until the displayed second changes
+                seconds_left = math.ceil(remaining)
+                wake_at = self.deadline - (seconds_left - 1)
+                self.condition.wait(wake_at - now)
+
+                if self.stopped:
+                    return
+                now = self.clock()
+                if self.is_paused or now < wake_at:
+                    continue
+
+                latency = now - wake_at
+                self.ticks += 1
+                self.total_tick_latency += latency
+                self.max_tick_latency = max(self.max_tick_latency, latency)
+                seconds_left = max(0, math.ceil(self.deadline - now))
+
+            if seconds_left > 0 and self.on_tick:
+                self.on_tick(seconds_left)
+
+        if self.on_tick:
+            self.on_tick(0)
+        if self.on_complete:
+            self.on_complete()
+
+
+class TimerController:
+    """Owns exactly one CountdownTimer at a time.
+
+    Every start() begins a new generation. Callbacks carry the generation they
+    were fired for, so ticks from a countdown that was reset or replaced can be
+    recognised and dropped with is_current(). No method waits for a worker
+    thread, so they are safe to call from the UI thread.
+    """
+
+    def __init__(self, on_tick=None, on_complete=None, clock=time.monotonic):
+        self.on_tick = on_tick            # called with (generation, seconds_left)
+        self.on_complete = on_complete    # called with (generation,)
+        self.clock = clock
+        self.generation = 0
+        self.countdown = None
+        self.lock = threading.Lock()
+
+    def start(self, duration, deadline=None):
+        """Cancel any running countdown and start a new one, returning its generation"""
+        with self.lock:
+            if self.countdown:
+                self.countdown.stop()
+            self.generation += 1
+            generation = self.generation
+            self.countdown = CountdownTimer(
+                duration,
+                on_tick=lambda seconds_left: self._dispatch_tick(generation, seconds_left),
+                on_complete=lambda: self._dispatch_complete(generation),
+                clock=self.clock
+            )
+            countdown = self.countdown
+        countdown.start(deadline)
+        return generation
+
+    def pause(self):
+        with self.lock:
+            if self.countdown:
+                self.countdown.pause()
+
+    def resume(self, deadline=None):
+        with self.lock:
+            if self.countdown:
+                self.countdown.resume(deadline)
+
+    def cancel(self):
+        """Stop the current countdown and invalidate its pending callbacks"""
+        with self.lock:
+            if self.countdown:
+                self.countdown.stop()
+                self.countdown = None
+            self.generation += 1
+
+    def is_current(self, generation):
+        with self.lock:
+            return generation == self.generation and self.countdown is not None
+
+    def time_left(self):
+        with self.lock:
+            return self.countdown.time_left() if self.countdown else None
+
+    def drift_report(self):
+        with self.lock:
+            return self.countdown.drift_report() if self.countdown else None
+
+    def _dispatch_tick(self, generation, seconds_left):
+        if self.on_tick and self.is_current(generation):
+            self.on_tick(generation, seconds_left)
+
+    def _dispatch_complete(self, generation):
+        if self.on_complete and self.is_current(generation):
+            self.on_complete(generation)
+
+
+class PomodoroEngine:
+    """Pomodoro session cycle without any UI.
+
+    Owns the mode, session count and countdown deadline, and applies the
+    custom_break_interval/long_break_frequency rules when a session ends.
+    Time comes from an injectable clock and only advances when poll() is
+    called, so a front end drives it from its own timer (e.g. TimerController
+    sharing the same deadline) and tests can drive it with a fake clock.
+
+    Events, delivered to callbacks registered with subscribe():
+        tick(time_left)                 displayed seconds changed
+        session_complete(mode, sessions) a countdown reached zero
+        mode_changed(mode)              a new mode was selected
+        state_changed()                 started, paused, resumed, reset, completed
+                                        or switched mode; a checkpoint is due
+    """
+
+    def __init__(self, settings, clock=time.monotonic):
+        self.settings = settings  # shared settings dict, read on every mode change
+        self.clock = clock
+        self.listeners = defaultdict(list)
+
+        self.mode = "pomodoro"
+        self.sessions = 0
+        self.is_running = False
+        self.is_paused = False
+        self.deadline = None        # clock() value at which the running session ends
+        self.paused_remaining = 0.0
+        self.started_at = None      # clock() values when the current session started and ended
+        self.ended_at = None
+        self.paused_at = None
+        self.pause_count = 0
+        self.paused_time = 0.0
+        self.completion_drift = None  # seconds between the deadline and completing the last session
+        self.total_time = self.mode_duration(self.mode)
+        self.time_left = self.total_time
+
+    def subscribe(self, event, callback):
+        self.listeners[event].append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners[event]:
+            callback(*args)
+
+    def mode_duration(self, mode):
+        """Length of a mode in seconds according to the current settings"""
+        return self.settings[MODE_TIME_SETTINGS[mode]] * 60
+
+    def switch_mode(self, mode):
+        """Select a mode and reload its length; ignored while running"""
+        if self.is_running:
+            return False
+        self.mode = mode
+        self.total_time = self.mode_duration(mode)
+        self.time_left = self.total_time
+        self.emit("mode_changed", mode)
+        self.emit("state_changed")
+        return True
+
+    def start(self):
+        if self.is_running:
+            return False
+        self.is_running = True
+        self.is_paused = False
+        self.started_at = self.clock()
+        self.ended_at = None
+        self.pause_count = 0
+        self.paused_time = 0.0
+        self.completion_drift = None
+        self.deadline = self.started_at + self.time_left
+        self.emit("state_changed")
+        return True
+
+    def pause(self):
+        if not self.is_running or self.is_paused:
+            return False
+        self.paused_at = self.clock()
+        self.paused_remaining = max(0.0, self.deadline - self.paused_at)
+        self.pause_count += 1
+        self.is_paused = True
+        self.emit("state_changed")
+        return True
+
+    def resume(self):
+        if not self.is_running or not self.is_paused:
+            return False
+        now = self.clock()
+        self.paused_time += now - self.paused_at
+        self.deadline = now + self.paused_remaining
+        self.is_paused = False
+        self.emit("state_changed")
+        return True
+
+    def toggle_pause(self):
+        if self.is_paused:
+            return self.resume()
+        return self.pause()
+
+    def reset(self):
+        """Stop the countdown and reload the current mode's length"""
+        self.is_running = False
+        self.is_paused = False
+        self.deadline = None
+        self.started_at = None
+        self.total_time = self.mode_duration(self.mode)
+        self.time_left = self.total_time
+        self.emit("tick", self.time_left)
+        self.emit("state_changed")
+
+    def remaining(self):
+        """Exact seconds left"""
+        if self.is_running and not self.is_paused:
+            return max(0.0, self.deadline - self.clock())
+        if self.is_paused:
+            return self.paused_remaining
+        return float(self.time_left)
+
+    def elapsed(self):
+        """Seconds since the current or last session was started, pauses included"""
+        if self.started_at is None:
+            return 0.0
+        if self.is_running:
+            return self.clock() - self.started_at
+        return self.ended_at - self.started_at
+
+    def seconds_until_next_tick(self):
+        """How long a driver may sleep before the displayed second changes"""
+        if not self.is_running or self.is_paused:
+            return None
+        remaining = self.remaining()
+        return remaining - (math.ceil(remaining) - 1) if remaining > 0 else 0.0
+
+    def poll(self):
+        """Advance to the current clock time, emitting tick and completion events"""
+        if not self.is_running or self.is_paused:
+            return
+        seconds_left = max(0, math.ceil(self.deadline - self.clock()))
+        if seconds_left != self.time_left:
+            self.time_left = seconds_left
+            self.emit("tick", seconds_left)
+        if seconds_left == 0:
+            self.complete_session()
+
+    def complete_session(self):
+        completed_mode = self.mode
+        now = self.clock()
+        self.completion_drift = now - self.deadline
+        # A deadline that passed while the app was closed ends the session then, not now
+        self.ended_at = min(now, self.deadline)
+        self.is_running = False
+        self.is_paused = False
+        self.deadline = None
+        self.time_left = 0
+
+        # Update session count for pomodoro sessions
+        if completed_mode == "pomodoro":
+            self.sessions += 1
+        self.emit("session_complete", completed_mode, self.sessions)
+        self.emit("state_changed")
+
+        # Auto-start next session if enabled
+        if self.settings["auto_start"]:
+            self.switch_mode(self.next_mode(completed_mode))
+
+    def checkpoint(self, wall_clock=time.time):
+        """Timer state with wall-clock times, enough to resume after a restart.
+
+        Holds a deadline rather than a countdown, so it only changes on state
+        transitions and never needs writing while the timer simply runs.
+        """
+        offset = wall_clock() - self.clock()
+        return {
+            "mode": self.mode,
+            "sessions": self.sessions,
+            "is_running": self.is_running,
+            "is_paused": self.is_paused,
+            "total_time": self.total_time,
+            "time_left": self.time_left,
+            "deadline": self.deadline + offset if self.deadline is not None else None,
+            "paused_remaining": self.paused_remaining,
+            "paused_at": self.paused_at + offset if self.is_paused else None,
+            "started_at": self.started_at + offset if self.started_at is not None else None,
+            "pause_count": self.pause_count,
+            "paused_time": self.paused_time
+        }
+
+    def restore(self, state, wall_clock=time.time):
+        """Load a checkpoint(); a running session keeps its original deadline"""
+        offset = wall_clock() - self.clock()
+        self.mode = state["mode"]
+        self.sessions = state["sessions"]
+        self.is_running = state["is_running"]
+        self.is_paused = state["is_paused"]
+        self.total_time = state["total_time"]
+        self.time_left = state["time_left"]
+        self.deadline = state["deadline"] - offset if state["deadline"] is not None else None
+        self.paused_remaining = state["paused_remaining"]
+        self.started_at = state["started_at"] - offset if state["started_at"] is not None else None
+        self.ended_at = None
+        self.pause_count = state["pause_count"]
+        self.paused_time = state["paused_time"]
+        self.paused_at = state["paused_at"] - offset if self.is_paused else None
+        if not self.is_running:
+            self.started_at = None
+
+    def next_mode(self, completed_mode):
+        """Mode that follows a completed session"""
+        if completed_mode != "pomodoro":
+            return "pomodoro"
+
+        # Check custom break interval
+        if self.sessions % self.settings["custom_break_interval"] == 0:
+            if self.sessions % self.settings["long_break_frequency"] == 0:
+                return "long_break"
+        return "short_break"
@@ -0,0 +1,116 @@
+"""
+Todo storage for Pomodoro Strike
+Indexed collection of tasks with a maintained display order
+"""
+
+import bisect
+import math
+from datetime import datetime
+
+# Task priorities from most to least urgent
+PRIORITY_ORDER = {"Urgent": 0, "High": 1, "Medium": 2, "Low": 3}
+
+
+def todo_sort_key(todo):
+    """Sort todos: incomplete first, then by priority, then by due date (undated last)"""
+    if todo.completed:
+        return (1, 0, 0)  # Completed tasks go last
+    due_ordinal = math.inf
+    if todo.due_date:
+        try:
+            due_ordinal = datetime.strptime(todo.due_date, "%Y-%m-%d").toordinal()
+        except ValueError:
+            pass
+    return (0, PRIORITY_ORDER.get(todo.priority, 2), due_ordinal)
+
+
+class TodoStore:
+    """Todos indexed by id and kept in display order.
+
+    by_id gives O(1) lookup, and order holds (sort key, id) entries sorted by
+    todo_sort_key with ties broken by id (i.e. creation time). Both are
+    maintained on add, update and remove, so reading the sorted view never
+    sorts, and a todo's sort key (including its parsed due date) is only
+    recomputed when that todo changes. Iterating the store yields todos in
+    the order they were added.
+    """
+
+    def __init__(self, todos=()):
+        self.load(todos)
+
+    def load(self, todos):
+        """Replace the contents with a list of todos"""
+        self.by_id = {}
+        self.keys = {}   # id -> cached sort key
+        for todo in todos:
+            self.by_id[todo.id] = todo
+            self.keys[todo.id] = todo_sort_key(todo)
+        self.order = sorted((key, todo_id) for todo_id, key in self.keys.items())
+        self.completed_count = sum(1 for todo in self.by_id.values() if todo.completed)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(list(self.by_id.values()))
+
+    def __contains__(self, todo_id):
+        return todo_id in self.by_id
+
+    def get(self, todo_id):
+        return self.by_id.get(todo_id)
+
+    def add(self, todo):
+        """Insert a todo at its sorted position and return that position"""
+        if todo.id in self.by_id:
+            self.remove(todo.id)
+        key = todo_sort_key(todo)
+        self.by_id[todo.id] = todo
+        self.keys[todo.id] = key
+        if todo.completed:
+            self.completed_count += 1
+        index = bisect.bisect_left(self.order, (key, todo.id))
+        self.order.insert(index, (key, todo.id))
+        return index
+
+    def remove(self, todo_id):
+        """Remove a todo and return the position it had, or None if unknown"""
+        todo = self.by_id.pop(todo_id, None)
+        if todo is None:
+            return None
+        key = self.keys.pop(todo_id)
+        index = bisect.bisect_left(self.order, (key, todo_id))
+        del self.order[index]
+        if key[0] == 1:
+            self.completed_count -= 1
+        return index
+
+    def update(self, todo):
+        """Re-index a todo after its fields changed; returns (old position, new position)"""
+        old_index = self.index_of(todo.id)
+        del self.order[old_index]
+
+        # The todo was usually mutated in place, so the cached key holds its old state
+        was_completed = self.keys[todo.id][0] == 1
+        if was_completed != bool(todo.completed):
+            self.completed_count += 1 if todo.completed else -1
+        self.by_id[todo.id] = todo
+        key = todo_sort_key(todo)
+        self.keys[todo.id] = key
+        new_index = bisect.bisect_left(self.order, (key, todo.id))
+        self.order.insert(new_index, (key, todo.id))
+        return old_index, new_index
+
+    def index_of(self, todo_id):
+        """Display position of a todo, found by binary search on its cached key"""
+        if todo_id not in self.keys:
+            return None
+        return bisect.bisect_left(self.order, (self.keys[todo_id], todo_id))
+
+    def todo_at(self, index):
+        """Todo at a display position"""
+        return self.by_id[self.order[index][1]]
+
+    def sorted(self, start=0, stop=None):
+        """Todos in display order, optionally a slice of it"""
+        return [self.by_id[todo_id] for _, todo_id in self.order[start:stop]]